@@ -0,0 +1,71 @@
+"""Streamlit-free core of the Solar21 evaluation tool
+
+Importing this package has no side effects: it reads nothing from disk and
+never imports Streamlit, so batch jobs, notebooks and workers can score
+sites directly:
+
+    from solar21_core import ScoringModel, compute_roof_score
+
+    model = ScoringModel.from_files()
+    result = model.score(answers, compute_roof_score(roof_area))
+
+Portfolios are scored in one vectorized pass with solar21_core.batch, and
+weight changes are previewed on a portfolio with solar21_core.whatif (the
+only modules that import NumPy).
+"""
+
+from .config import (
+    DEFAULT_QUESTIONS,
+    DEFAULT_WEIGHTS,
+    QUESTIONS_FILE,
+    WEIGHTS_FILE,
+    config_fingerprint,
+    load_questions,
+    load_weights,
+    save_questions,
+    save_weights,
+)
+from .scoring import (
+    DEFAULT_OPTION_SCORE,
+    INTERPRETATION_TEXT,
+    RECOMMENDATION_TEXT,
+    SCORE_BANDS,
+    SCORING_LANGUAGES,
+    ReloadingModel,
+    ScoreResult,
+    ScoringModel,
+    compute_detailed_scores,
+    compute_final_score,
+    compute_question_score,
+    compute_roof_score,
+    get_score_interpretation,
+    match_option,
+    score_band,
+)
+
+__all__ = [
+    "DEFAULT_QUESTIONS",
+    "DEFAULT_WEIGHTS",
+    "QUESTIONS_FILE",
+    "WEIGHTS_FILE",
+    "config_fingerprint",
+    "load_questions",
+    "load_weights",
+    "save_questions",
+    "save_weights",
+    "DEFAULT_OPTION_SCORE",
+    "INTERPRETATION_TEXT",
+    "RECOMMENDATION_TEXT",
+    "SCORE_BANDS",
+    "SCORING_LANGUAGES",
+    "ReloadingModel",
+    "ScoreResult",
+    "ScoringModel",
+    "compute_detailed_scores",
+    "compute_final_score",
+    "compute_question_score",
+    "compute_roof_score",
+    "get_score_interpretation",
+    "match_option",
+    "score_band",
+]
@@ -0,0 +1,7 @@
+"""Allow running the batch scorer as `python -m solar21_core`"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,300 @@
+"""Static assets (theme stylesheet, logo variants, intro video) for Streamlit static file serving
+
+Images are written once into the app's static/ folder under content-hashed
+names (logo-250-1a2b3c4d.webp), so the app can reference them by URL
+instead of inlining megabytes of base64 on every rerun, and any cache may
+keep them forever: a new logo gets a new name. Existing variants are reused,
+so building at startup is cheap after the first run.
+
+Streamlit's app/static route cannot send Cache-Control: it sends ETag and
+Last-Modified only (and no 304s), so browsers cache these files only
+heuristically and download them again when that expires. To have them
+cached as immutable, the proxy in front of the app has to add
+"Cache-Control: public, max-age=31536000, immutable" for /app/static/
+(see the README).
+
+AssetRegistry resolves, publishes and renders everything once; the app keeps
+one per process and only calls reload() after a deploy replaces the files.
+
+Pillow is imported lazily and ffmpeg is only used when it is on PATH;
+without them the original files are served as is.
+
+    python -m solar21_core.assets static    # build ahead of deployment
+"""
+
+import hashlib
+import importlib.util
+import shutil
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+LOGO_CANDIDATES = (
+    "solar21_logo.png",
+    "Solar21app/solar21_logo.png",
+    "./solar21_logo.png",
+    "../solar21_logo.png",
+)
+# Displayed width in CSS pixels; 2x covers high-density screens
+LOGO_WIDTH = 250
+LOGO_DENSITIES = (1, 2)
+LOGO_FORMATS = ("webp", "png")
+
+STATIC_URL = "app/static"
+
+
+def find_first(paths):
+    """First path that exists, or None"""
+    for path in paths:
+        if Path(path).is_file():
+            return Path(path)
+    return None
+
+
+def _content_hash(path):
+    digest = hashlib.blake2b(digest_size=4)
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _build(target, make):
+    """Run make(temporary path) unless target exists, then move the result into place
+
+    Concurrent readers (other sessions, the static route) never see half a file.
+    """
+    if target.exists():
+        return
+    partial = target.with_name(f".partial-{target.name}")
+    try:
+        make(partial)
+        partial.replace(target)
+    finally:
+        partial.unlink(missing_ok=True)
+
+
+def _save_resized(source, target, width, fmt):
+    from PIL import Image
+
+    with Image.open(source) as image:
+        height = round(image.height * width / image.width)
+        mode = "RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB"
+        resized = image.convert(mode).resize((width, height), Image.LANCZOS)
+    if fmt == "webp":
+        resized.save(target, "WEBP", quality=90, method=6)
+    else:
+        resized.save(target, "PNG", optimize=True)
+
+
+def build_logo_variants(source, static_dir, tag=None, width=LOGO_WIDTH, densities=LOGO_DENSITIES,
+                        formats=LOGO_FORMATS):
+    """Write resized logo variants into static_dir; returns {(density, format): file name}
+
+    tag is the source's content hash (computed if not given). Falls back to a
+    copy of the original ({(1, "png"): name}) when Pillow is not installed.
+    """
+    static_dir = Path(static_dir)
+    static_dir.mkdir(parents=True, exist_ok=True)
+    tag = tag or _content_hash(source)
+
+    if importlib.util.find_spec("PIL") is None:
+        name = f"logo-{tag}{Path(source).suffix.lower()}"
+        _build(static_dir / name, lambda out: shutil.copyfile(source, out))
+        return {(1, "png"): name}
+
+    variants = {}
+    for density in densities:
+        for fmt in formats:
+            name = f"logo-{width * density}-{tag}.{fmt}"
+            _build(static_dir / name, lambda out: _save_resized(source, out, width * density, fmt))
+            variants[(density, fmt)] = name
+    return variants
+
+
+def srcset(variants, fmt):
+    """srcset attribute value ("url 1x, url 2x") for one format"""
+    return ", ".join(
+        f"{STATIC_URL}/{name} {density}x" for (density, variant_fmt), name in sorted(variants.items())
+        if variant_fmt == fmt
+    )
+
+
+def logo_html(variants, width=LOGO_WIDTH):
+    """<picture> element serving WebP where supported and PNG otherwise"""
+    sources = "".join(
+        f'<source type="image/{fmt}" srcset="{srcset(variants, fmt)}">'
+        for fmt in LOGO_FORMATS if fmt != "png" and srcset(variants, fmt)
+    )
+    fallback = variants.get((1, "png")) or next(iter(variants.values()))
+    return (
+        f"<picture>{sources}"
+        f'<img src="{STATIC_URL}/{fallback}" srcset="{srcset(variants, "png")}" '
+        f'width="{width}" style="width: {width}px; height: auto;" alt="Solar21 Logo">'
+        f"</picture>"
+    )
+
+
+# -------------------------------------------------------
+# INTRO VIDEO
+# -------------------------------------------------------
+VIDEO_CANDIDATES = ("My Movie.mp4", "Solar21app/My Movie.mp4", "./My Movie.mp4")
+# Variant for phones and slow connections
+VIDEO_LOW_HEIGHT = 480
+VIDEO_LOW_BITRATE = "600k"
+POSTER_AT_SECONDS = 1
+
+
+def _ffmpeg(*args):
+    subprocess.run(["ffmpeg", "-y", "-loglevel", "error", *args], check=True, capture_output=True, timeout=600)
+
+
+def build_video_variants(source, static_dir, tag=None):
+    """Publish the intro video in static_dir; returns {"full", "low", "poster"} file names
+
+    With ffmpeg, "full" is remuxed with its index (moov atom) at the front so
+    playback starts after the first chunk, "low" is a 480p low-bitrate
+    encode and "poster" a JPEG frame. Without ffmpeg, or if it fails, "full"
+    is a copy of the original and "low"/"poster" are None. Served through
+    the static route, every file supports HTTP range requests.
+    """
+    static_dir = Path(static_dir)
+    static_dir.mkdir(parents=True, exist_ok=True)
+    tag = tag or _content_hash(source)
+    names = {
+        "full": f"intro-{tag}.mp4",
+        "low": f"intro-{VIDEO_LOW_HEIGHT}p-{tag}.mp4",
+        "poster": f"intro-poster-{tag}.jpg",
+    }
+
+    if shutil.which("ffmpeg"):
+        try:
+            _build(static_dir / names["full"], lambda out: _ffmpeg(
+                "-i", str(source), "-c", "copy", "-movflags", "+faststart", "-f", "mp4", str(out)))
+            _build(static_dir / names["low"], lambda out: _ffmpeg(
+                "-i", str(source), "-vf", f"scale=-2:{VIDEO_LOW_HEIGHT}", "-c:v", "libx264",
+                "-b:v", VIDEO_LOW_BITRATE, "-maxrate", VIDEO_LOW_BITRATE, "-bufsize", "1200k",
+                "-preset", "slow", "-an", "-movflags", "+faststart", "-f", "mp4", str(out)))
+            _build(static_dir / names["poster"], lambda out: _ffmpeg(
+                "-ss", str(POSTER_AT_SECONDS), "-i", str(source), "-frames:v", "1", "-q:v", "3",
+                "-f", "image2", "-c:v", "mjpeg", str(out)))
+            return names
+        except (OSError, subprocess.SubprocessError):
+            pass
+
+    _build(static_dir / names["full"], lambda out: shutil.copyfile(source, out))
+    return {"full": names["full"], "low": None, "poster": None}
+
+
+def video_html(variants, element_id="introVideo"):
+    """Autoplaying, muted <video> using the low-bitrate variant on small screens"""
+    poster = f' poster="{STATIC_URL}/{variants["poster"]}"' if variants.get("poster") else ""
+    low = (f'<source src="{STATIC_URL}/{variants["low"]}" type="video/mp4" media="(max-width: 800px)">'
+           if variants.get("low") else "")
+    return (
+        f'<video id="{element_id}" autoplay muted playsinline preload="auto"{poster}>'
+        f"{low}"
+        f'<source src="{STATIC_URL}/{variants["full"]}" type="video/mp4">'
+        "Your browser does not support the video tag."
+        "</video>"
+    )
+
+
+# -------------------------------------------------------
+# THEME STYLESHEET
+# -------------------------------------------------------
+THEME_FILE = Path(__file__).with_name("theme.css")
+
+
+def build_stylesheet(source, static_dir, tag=None):
+    """Publish the theme stylesheet in static_dir; returns {"css": file name}"""
+    static_dir = Path(static_dir)
+    static_dir.mkdir(parents=True, exist_ok=True)
+    name = f"theme-{tag or _content_hash(source)}.css"
+    _build(static_dir / name, lambda out: shutil.copyfile(source, out))
+    return {"css": name}
+
+
+def stylesheet_html(files):
+    """A tiny <style> that pulls the cached stylesheet in, instead of resending the CSS on every rerun"""
+    return f'<style>@import url("{STATIC_URL}/{files["css"]}");</style>'
+
+
+# -------------------------------------------------------
+# REGISTRY
+# -------------------------------------------------------
+@dataclass(frozen=True)
+class Asset:
+    """A resolved source file, the files published for it and its rendered markup"""
+
+    path: Path
+    size: int
+    etag: str              # content hash of the source, also part of every published name
+    files: dict = field(default_factory=dict)
+    html: str = ""
+
+
+class AssetRegistry:
+    """The app's stylesheet, logo and intro video, resolved once per process
+
+    Holds everything the page needs (paths, sizes, content hashes, published
+    file names, pre-rendered HTML), so reruns do no filesystem work. Call
+    reload() after a deploy replaces the source files.
+    """
+
+    def __init__(self, static_dir, logo_candidates=LOGO_CANDIDATES, video_candidates=VIDEO_CANDIDATES):
+        self.static_dir = Path(static_dir)
+        self.logo_candidates = logo_candidates
+        self.video_candidates = video_candidates
+        self.theme = None
+        self.logo = None
+        self.video = None
+        self._lock = threading.Lock()
+        self.reload()
+
+    def _resolve(self, candidates, build, render):
+        path = find_first(candidates)
+        if path is None:
+            return None
+        try:
+            etag = _content_hash(path)
+            files = build(path, self.static_dir, tag=etag)
+            return Asset(path=path, size=path.stat().st_size, etag=etag, files=files, html=render(files))
+        except OSError:
+            return None
+
+    def reload(self):
+        """Re-resolve every asset (picks up replaced files; unchanged ones are not rebuilt)"""
+        with self._lock:
+            self.theme = self._resolve((THEME_FILE,), build_stylesheet, stylesheet_html)
+            if self.theme is None:
+                # static/ not writable: fall back to inlining the stylesheet
+                css = THEME_FILE.read_text(encoding="utf-8")
+                self.theme = Asset(path=THEME_FILE, size=len(css), etag="", html=f"<style>{css}</style>")
+            self.logo = self._resolve(self.logo_candidates, build_logo_variants, logo_html)
+            self.video = self._resolve(self.video_candidates, build_video_variants, video_html)
+        return self
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    static_dir = Path(argv[0]) if argv else Path("static")
+    registry = AssetRegistry(static_dir)
+    built = [(f"theme {kind}", name) for kind, name in registry.theme.files.items()]
+    if registry.logo is not None:
+        built += [(f"logo {density}x {fmt}", name) for (density, fmt), name in sorted(registry.logo.files.items())]
+    if registry.video is not None:
+        built += [(f"video {kind}", name) for kind, name in registry.video.files.items() if name]
+    if not built:
+        print("solar21-assets: no logo or intro video found", file=sys.stderr)
+        return 1
+    for label, name in built:
+        size = (static_dir / name).stat().st_size
+        print(f"{static_dir / name}  {label}  {size / 1024:.1f} KiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Vectorized scoring of whole portfolios with NumPy
+
+The answer matrix has one column per question of the model, in the order of
+questions.json:
+
+- select questions hold the 0-based option index (-1 if the answer matched
+  no option, which scores like an unknown label in the scalar path);
+- slider questions hold the slider value;
+- NaN marks an unanswered question.
+
+encode_answers builds that matrix from the answer dicts used by the app.
+Results are identical to ScoringModel.score for every site.
+
+NumPy is only imported here, so importing solar21_core stays fast.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .scoring import SCORE_BANDS
+
+# Band lower bounds in ascending order, and band names worst-first to match
+BAND_NAMES = tuple(band for band, _ in SCORE_BANDS)
+_BAND_LOWER_BOUNDS = np.array([lower for _, lower in reversed(SCORE_BANDS[:-1])])
+
+
+@dataclass
+class BatchResult:
+    """Scores for a portfolio; every array has one entry per site
+
+    bands holds indices into BAND_NAMES (0 = "exceptional" ... 4 = "poor").
+    """
+
+    final_scores: np.ndarray
+    structure_totals: np.ndarray
+    consumption_totals: np.ndarray
+    roof_scores: np.ndarray
+    bands: np.ndarray
+
+    @property
+    def band_names(self):
+        return np.array(BAND_NAMES, dtype=object)[self.bands]
+
+    def __len__(self):
+        return len(self.final_scores)
+
+
+def encode_answers(answers_list, model):
+    """Encode answer dicts into the matrix expected by score_batch"""
+    matrix = np.full((len(answers_list), len(model.compiled)), np.nan)
+    for col, cq in enumerate(model.compiled):
+        is_slider = cq.kind == "slider"
+        for row, answers in enumerate(answers_list):
+            value = answers.get(cq.id)
+            if value is None:
+                continue
+            matrix[row, col] = value if is_slider else cq.option_index(value)
+    return matrix
+
+
+def compute_roof_scores(roof_areas):
+    """Vectorized compute_roof_score; NaN (missing) and non-positive areas score 0"""
+    areas = np.asarray(roof_areas, dtype=float)
+    scores = np.ones(areas.shape, dtype=np.int64)
+    scores[areas >= 500] = 2
+    scores[areas > 1000] = 3
+    scores[~(areas > 0)] = 0
+    return scores
+
+
+def _question_scores(cq, column):
+    """Raw scores of one answer column (meaningless where the column is NaN)"""
+    answered = ~np.isnan(column)
+    if cq.kind == "slider":
+        mins = np.asarray(cq.threshold_mins, dtype=float)
+        index = np.searchsorted(mins, np.where(answered, column, 0.0), side="right") - 1
+        table = np.asarray(cq.threshold_scores)
+    else:
+        index = np.where(answered, column, -1).astype(np.int64)
+        # Out-of-range indices count as "no option matched"
+        index[(index < -1) | (index >= len(cq.option_scores) - 1)] = -1
+        table = np.asarray(cq.option_scores)
+    return table[index], answered
+
+
+def _category_totals(columns, n_sites):
+    """Weighted mean of (normalized, weight, answered) columns, renormalized per site
+
+    Follows the scalar path's operation order (weights summed in question
+    order, then score * (weight / total)) so results match bit for bit.
+    """
+    total_weight = np.zeros(n_sites)
+    for _, weight, answered in columns:
+        total_weight = total_weight + np.where(answered, weight, 0.0)
+
+    has_weight = total_weight != 0
+    safe_total = np.where(has_weight, total_weight, 1.0)
+    total = np.zeros(n_sites)
+    for normalized, weight, answered in columns:
+        total = total + np.where(answered, normalized * (weight / safe_total), 0.0)
+    return np.where(has_weight, total, 0.0)
+
+
+def _round_1(values):
+    """round(value, 1) for every element, matching Python's correctly-rounded result"""
+    rounded = np.round(values, 1)
+    # np.round scales by 10 first, which can land on the other side of a tie;
+    # redo the (rare) near-ties with Python's round
+    scaled = values * 10
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        rounded[i] = round(float(values[i]), 1)
+    return rounded
+
+
+def score_bands(final_scores):
+    """Band index (into BAND_NAMES) for each final score"""
+    reached = np.searchsorted(_BAND_LOWER_BOUNDS, final_scores, side="right")
+    return len(BAND_NAMES) - 1 - reached
+
+
+def score_batch(roof_areas, answer_matrix, model):
+    """Score a whole portfolio at once
+
+    roof_areas: one roof area (m²) per site, NaN when unknown.
+    answer_matrix: (sites x questions) array, see the module docstring.
+    """
+    roof_areas = np.asarray(roof_areas, dtype=float)
+    answer_matrix = np.asarray(answer_matrix, dtype=float)
+    n_sites = len(roof_areas)
+    if answer_matrix.shape != (n_sites, len(model.compiled)):
+        raise ValueError(
+            f"answer_matrix must have shape ({n_sites}, {len(model.compiled)}), got {answer_matrix.shape}"
+        )
+
+    roof_scores = compute_roof_scores(roof_areas)
+    roof_norm = np.where(roof_scores > 0, roof_scores / 3, 0.0)
+    structure = [(roof_norm, model.roof_weight, np.ones(n_sites, dtype=bool))]
+    consumption = []
+
+    for col, cq in enumerate(model.compiled):
+        scores, answered = _question_scores(cq, answer_matrix[:, col])
+        normalized = scores / cq.max_score if cq.max_score > 0 else np.zeros(n_sites)
+        if cq.category == "structure":
+            structure.append((normalized, cq.weight, answered))
+        else:
+            consumption.append((normalized, cq.weight, answered))
+
+    structure_norm = _category_totals(structure, n_sites)
+    consumption_norm = _category_totals(consumption, n_sites)
+
+    final = model.structure_weight * structure_norm + model.consumption_weight * consumption_norm
+    final_scores = _round_1(final * 100)
+
+    return BatchResult(
+        final_scores=final_scores,
+        structure_totals=structure_norm * 100,
+        consumption_totals=consumption_norm * 100,
+        roof_scores=roof_scores,
+        bands=score_bands(final_scores),
+    )
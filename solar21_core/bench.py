@@ -0,0 +1,382 @@
+"""Benchmarks for the scoring hot path
+
+Times site scoring (final score and detailed breakdown, site by site and
+batched), single question scoring (uncompiled and compiled) and the score
+interpretation over 1 / 10 / 1000 / 100k sites, 6 / 20 / 50 questions and
+the three languages. Besides exact labels, answers can be partial labels
+(the memoized substring fallback) or unknown text that is different for
+every site, the worst case where every answer runs the full scan.
+
+Question sets are generated from DEFAULT_QUESTIONS and answers from a fixed
+seed, so runs are comparable across machines and config edits. Results are
+written as JSON; --compare checks them against an earlier run.
+
+    python -m solar21_core.bench -o before.json
+    python -m solar21_core.bench -o after.json --compare before.json
+"""
+
+import argparse
+import copy
+import gc
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .config import DEFAULT_QUESTIONS, DEFAULT_WEIGHTS
+from .scoring import (
+    SCORE_BANDS,
+    SCORING_LANGUAGES,
+    ScoringModel,
+    compute_detailed_scores,
+    compute_final_score,
+    compute_question_score,
+    get_score_interpretation,
+)
+
+SITE_COUNTS = (1, 10, 1000, 100_000)
+QUESTION_COUNTS = (6, 20, 50)
+ANSWER_KINDS = ("exact", "partial", "unknown")
+# Answers scored per case by the single-answer benchmarks
+ANSWER_SAMPLE = 10_000
+SEED = 21
+DEFAULT_THRESHOLD = 1.25
+
+RESULTS_VERSION = 1
+
+
+# -------------------------------------------------------
+# SYNTHETIC INPUTS
+# -------------------------------------------------------
+def make_questions(n_questions):
+    """n_questions questions cycling through DEFAULT_QUESTIONS with unique IDs"""
+    questions = []
+    for i in range(n_questions):
+        question = copy.deepcopy(DEFAULT_QUESTIONS[i % len(DEFAULT_QUESTIONS)])
+        round_ = i // len(DEFAULT_QUESTIONS)
+        if round_:
+            question["id"] = f"{question['id']}_{round_}"
+        questions.append(question)
+    return questions
+
+
+def make_answer(question, rng, lang, kind, serial):
+    """One answer of the given kind; sliders always get a value"""
+    if question["type"] == "slider":
+        return rng.randint(question.get("min_value", 0), question.get("max_value", 100))
+    label = rng.choice(question["options"])["labels"][lang]
+    if kind == "exact":
+        return label
+    if kind == "partial":
+        # Truncated label, as saved by older versions of the app
+        return label[: max(3, len(label) * 2 // 3)]
+    # Text matching no option, different for every site so the memo never helps
+    return f"§ not an option #{serial}"
+
+
+def make_sites(questions, n_sites, lang="en", kind="exact", seed=SEED):
+    """(answers, roof_score) for n_sites sites with every question answered"""
+    rng = random.Random(seed)
+    sites = []
+    for serial in range(n_sites):
+        answers = {q["id"]: make_answer(q, rng, lang, kind, serial) for q in questions}
+        sites.append((answers, rng.randint(0, 3)))
+    return sites
+
+
+def make_answers(question, n_answers, lang, kind, seed=SEED):
+    rng = random.Random(seed)
+    return [make_answer(question, rng, lang, kind, serial) for serial in range(n_answers)]
+
+
+# -------------------------------------------------------
+# TIMING
+# -------------------------------------------------------
+def _measure(run, setup=None, min_repeats=3, max_repeats=25, budget=0.5):
+    """Wall-clock seconds of run() for as many repeats as fit the budget
+
+    setup() runs untimed before each repeat (e.g. to get a fresh model so
+    memoized fallbacks are measured cold).
+    """
+    timings = []
+    started = time.perf_counter()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while len(timings) < max_repeats:
+            state = setup() if setup else None
+            begin = time.perf_counter()
+            run(state)
+            timings.append(time.perf_counter() - begin)
+            if len(timings) >= min_repeats and time.perf_counter() - started > budget:
+                break
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return timings
+
+
+def _record(name, params, n_items, timings):
+    median = statistics.median(timings)
+    return {
+        "name": name,
+        "params": params,
+        "n_items": n_items,
+        "repeats": len(timings),
+        "min_s": min(timings),
+        "median_s": median,
+        "per_item_us": median / n_items * 1e6,
+    }
+
+
+def calibrate():
+    """Best time of a fixed pure-Python workload, to factor out machine speed in comparisons"""
+    def workload(_):
+        table = {f"label {i}": i for i in range(64)}
+        total = 0
+        for i in range(50_000):
+            total += table.get(f"label {i & 63}", 0) * 0.5
+        return total
+
+    return min(_measure(workload, min_repeats=5, max_repeats=5))
+
+
+def case_key(case):
+    params = ",".join(f"{key}={value}" for key, value in sorted(case["params"].items()))
+    return f"{case['name']}[{params}]"
+
+
+# -------------------------------------------------------
+# BENCHMARKS
+# -------------------------------------------------------
+def _models(question_counts):
+    return {n: make_questions(n) for n in question_counts}
+
+
+def bench_sites(site_counts, question_counts, budget):
+    """compute_final_score / compute_detailed_scores site by site, and score_batch"""
+    from .batch import encode_answers, score_batch
+
+    results = []
+    for n_questions, questions in _models(question_counts).items():
+        for n_sites in site_counts:
+            sites = make_sites(questions, n_sites)
+            params = {"sites": n_sites, "questions": n_questions}
+
+            def final(model, sites=sites):
+                for answers, roof_score in sites:
+                    compute_final_score(answers, roof_score, model)
+
+            def detailed(model, sites=sites):
+                for answers, roof_score in sites:
+                    compute_detailed_scores(answers, roof_score, model)
+
+            model = ScoringModel(questions, DEFAULT_WEIGHTS)
+            results.append(_record("final_score", params, n_sites,
+                                   _measure(final, lambda: model, budget=budget)))
+            results.append(_record("detailed_scores", params, n_sites,
+                                   _measure(detailed, lambda: model, budget=budget)))
+
+            roof_areas = [(0, 300, 700, 1500)[roof_score] for _, roof_score in sites]
+            matrix = encode_answers([answers for answers, _ in sites], model)
+            results.append(_record("score_batch", params, n_sites, _measure(
+                lambda m: score_batch(roof_areas, matrix, m), lambda: model, budget=budget)))
+    return results
+
+
+def bench_languages(n_sites, n_questions, budget):
+    """Site scoring with exact, partial and unknown answers in every language
+
+    A new model is compiled (untimed) for every repeat, so partial answers
+    are timed with a cold memo.
+    """
+    questions = make_questions(n_questions)
+    results = []
+    for lang in SCORING_LANGUAGES:
+        for kind in ANSWER_KINDS:
+            sites = make_sites(questions, n_sites, lang, kind)
+
+            def final(model, sites=sites):
+                for answers, roof_score in sites:
+                    compute_final_score(answers, roof_score, model)
+
+            params = {"sites": n_sites, "questions": n_questions, "lang": lang, "answers": kind}
+            results.append(_record("final_score_by_answer", params, n_sites, _measure(
+                final, lambda: ScoringModel(questions, DEFAULT_WEIGHTS), budget=budget)))
+    return results
+
+
+def bench_question_score(budget):
+    """compute_question_score (raw question dicts) vs compiled questions, per answer kind"""
+    question = next(q for q in DEFAULT_QUESTIONS if q["type"] == "select")
+    results = []
+    for lang in SCORING_LANGUAGES:
+        for kind in ANSWER_KINDS:
+            answers = make_answers(question, ANSWER_SAMPLE, lang, kind)
+            params = {"lang": lang, "answers": kind}
+
+            def uncompiled(_, answers=answers):
+                for answer in answers:
+                    compute_question_score(question, answer)
+
+            def compiled(cq, answers=answers):
+                for answer in answers:
+                    cq.score(answer)
+
+            results.append(_record("question_score", params, ANSWER_SAMPLE,
+                                   _measure(uncompiled, budget=budget)))
+            results.append(_record("compiled_question_score", params, ANSWER_SAMPLE, _measure(
+                compiled, lambda: ScoringModel([question], DEFAULT_WEIGHTS).compiled[0], budget=budget)))
+    return results
+
+
+def bench_interpretation(budget):
+    rng = random.Random(SEED)
+    # Spread over every band, including the exact band boundaries
+    scores = [round(rng.uniform(0, 100), 1) for _ in range(ANSWER_SAMPLE)]
+    scores[: len(SCORE_BANDS) - 1] = [lower for _, lower in SCORE_BANDS[:-1]]
+    results = []
+    for lang in SCORING_LANGUAGES:
+        def interpret(_, lang=lang):
+            for score in scores:
+                get_score_interpretation(score, lang)
+
+        results.append(_record("interpretation", {"lang": lang}, ANSWER_SAMPLE,
+                               _measure(interpret, budget=budget)))
+    return results
+
+
+def bench_compile(question_counts, budget):
+    results = []
+    for n_questions, questions in _models(question_counts).items():
+        results.append(_record("compile_model", {"questions": n_questions}, 1, _measure(
+            lambda _, questions=questions: ScoringModel(questions, DEFAULT_WEIGHTS), budget=budget)))
+    return results
+
+
+def run_all(site_counts=SITE_COUNTS, question_counts=QUESTION_COUNTS, budget=0.5, progress=None):
+    """Run every benchmark and return the results document"""
+    groups = [
+        ("sites", lambda: bench_sites(site_counts, question_counts, budget)),
+        ("languages", lambda: bench_languages(1000, 20, budget)),
+        ("question_score", lambda: bench_question_score(budget)),
+        ("interpretation", lambda: bench_interpretation(budget)),
+        ("compile", lambda: bench_compile(question_counts, budget)),
+    ]
+    cases = []
+    for name, run in groups:
+        if progress:
+            progress(name)
+        cases.extend(run())
+    return {"version": RESULTS_VERSION, "meta": environment(), "cases": cases}
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=Path(__file__).parent, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "numpy": numpy_version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "calibration_s": calibrate(),
+    }
+
+
+# -------------------------------------------------------
+# COMPARISON
+# -------------------------------------------------------
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Rows (key, baseline time, current time, ratio) and the keys slower than threshold
+
+    Uses the best of the repeats, which is much less sensitive to a busy
+    machine than the median, scaled by the calibration workload of both runs
+    so a slower (or throttled) machine does not read as a regression.
+    """
+    speed = current["meta"]["calibration_s"] / baseline["meta"]["calibration_s"]
+    before = {case_key(case): case for case in baseline["cases"]}
+    rows, regressions = [], []
+    for case in current["cases"]:
+        key = case_key(case)
+        if key not in before:
+            continue
+        ratio = case["min_s"] / before[key]["min_s"] / speed
+        rows.append((key, before[key]["min_s"], case["min_s"], ratio))
+        if ratio > threshold:
+            regressions.append(key)
+    return rows, regressions
+
+
+def _format_seconds(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+# -------------------------------------------------------
+# ENTRY POINT
+# -------------------------------------------------------
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="solar21-bench",
+        description="Benchmark the Solar21 scoring hot path and store the results as JSON.",
+    )
+    parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare with an earlier results file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"slowdown ratio reported as a regression (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--quick", action="store_true", help="skip the 100k-site cases and shorten repeats")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    site_counts = tuple(n for n in SITE_COUNTS if n < 100_000) if args.quick else SITE_COUNTS
+    budget = 0.1 if args.quick else 0.5
+
+    results = run_all(site_counts, budget=budget,
+                      progress=lambda name: print(f"solar21-bench: {name}", file=sys.stderr))
+    for case in results["cases"]:
+        print(f"{case_key(case):70} {_format_seconds(case['median_s']):>10}  "
+              f"{case['per_item_us']:10.2f} µs/item")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"solar21-bench: results written to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        rows, regressions = compare(baseline, results, args.threshold)
+        speed = results["meta"]["calibration_s"] / baseline["meta"]["calibration_s"]
+        print(f"\nCompared with {args.compare} ({baseline['meta'].get('commit')}), "
+              f"ratios adjusted for machine speed x{speed:.2f}:")
+        for key, before, after, ratio in rows:
+            flag = "  << slower" if key in regressions else ""
+            print(f"{key:70} {_format_seconds(before):>10} -> {_format_seconds(after):>10}  x{ratio:.2f}{flag}")
+        if regressions:
+            print(f"solar21-bench: {len(regressions)} case(s) slower than x{args.threshold}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""Compare the results-page site card renderers by what they send to the browser
+
+Renders the site cards of the same synthetic portfolio headless
+(streamlit.testing), once as the app does (one HTML block per card) and
+once with the previous element-per-row card, kept here as
+render_card_widgets, and reports, per run, the number of deltas (one per
+element or layout block) and their serialized protobuf size, i.e. the
+websocket traffic of one rerun.
+
+    python -m solar21_core.bench_render [--sites 1 10]
+
+Needs Streamlit (imported lazily, unlike the rest of solar21_core).
+"""
+
+import argparse
+import sys
+import time
+
+from .i18n import TEXT
+from .render import _category_class, _factor_class, score_color, site_card_html, site_factors
+from .scoring import ScoringModel, compute_roof_score, get_score_interpretation
+from .whatif import sample_answers
+
+
+def portfolio(model, n_sites):
+    """(sites, answers) in the session-state format of the app (option indices), drawn at random"""
+    roof_areas, matrix = sample_answers(model, n_sites)
+    sites, answers = [], {}
+    for idx in range(n_sites):
+        roof_area = None if roof_areas[idx] != roof_areas[idx] else float(roof_areas[idx])
+        sites.append({"address": f"Teststrasse {idx + 1}, 8000 Zürich", "canton": "ZH", "roof_area": roof_area,
+                      "roof_pitch": None, "roof_orientation": None})
+        answers[idx] = {question["id"]: int(matrix[idx, col]) for col, question in enumerate(model.questions)}
+    return sites, answers
+
+
+# -------------------------------------------------------
+# CARD RENDERERS
+# -------------------------------------------------------
+def render_card_html(site, answers, result, model, lang):
+    """The card as the app renders it: a single st.markdown element"""
+    import streamlit as st
+
+    st.markdown(site_card_html(site, answers, result, model, lang), unsafe_allow_html=True)
+
+
+def _category_card(st, icon, title, score, weight):
+    st.markdown(f"""
+    <div class="category-card">
+        <div class="category-header">
+            <span class="category-title">{icon} {title}</span>
+            <span class="category-score">{score}%</span>
+        </div>
+        <div class="progress-bar-container">
+            <div class="progress-bar-fill {_category_class(score)}" style="width: {score}%;"></div>
+        </div>
+        <small style="color: #888;">Weight: {round(weight * 100)}%</small>
+    </div>
+    """, unsafe_allow_html=True)
+
+
+def _factor_row(st, name, data, value):
+    st.markdown(f"""
+    <div class="factor-row">
+        <span class="factor-name">{name}</span>
+        <div class="factor-bar">
+            <div class="progress-bar-container">
+                <div class="progress-bar-fill {_factor_class(data['normalized'])}" style="width: {data['normalized']}%;"></div>
+            </div>
+        </div>
+        <span class="factor-score">{data['score']}/{data['max']}</span>
+    </div>
+    """, unsafe_allow_html=True)
+    st.caption(f"↳ {value}")
+
+
+def _insight_cards(st, title, factors, empty, extra, icon):
+    st.markdown(f"**{title}**")
+    if not factors:
+        st.caption(empty)
+    for name, score in factors:
+        st.markdown(f"""
+        <div class="insight-card{extra}">
+            <span class="insight-icon">{icon}</span>{name} ({round(score)}%)
+        </div>
+        """, unsafe_allow_html=True)
+
+
+def render_card_widgets(site, answers, result, model, lang):
+    """The previous card: the same content as separate Streamlit elements (one per row)"""
+    import streamlit as st
+
+    texts = TEXT[lang]
+    final_score = result.final_score
+    details = result.details()
+    interpretation, recommendation, emoji = get_score_interpretation(final_score, lang)
+    structure, consumption = site_factors(site, answers, details, model, lang)
+
+    st.markdown(f"### 📍 {site['address']} ({site['canton']})")
+    st.markdown(f"""
+    <div class="score-hero">
+        <p class="score-hero-value" style="color: {score_color(final_score)} !important;">{final_score}</p>
+        <p class="score-hero-label">{texts["score_label"]} / 100</p>
+        <p class="score-hero-interpretation">{emoji} {interpretation}</p>
+        <p class="score-hero-recommendation">{recommendation}</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    col_struct, col_cons = st.columns(2)
+    with col_struct:
+        _category_card(st, "🏗️", texts["structure_score_label"], round(details["structure_total"], 1),
+                       details["structure_weight"])
+    with col_cons:
+        _category_card(st, "⚡", texts["consumption_score_label"], round(details["consumption_total"], 1),
+                       details["consumption_weight"])
+
+    with st.expander(f"📊 {texts['factor_analysis']}", expanded=True):
+        st.markdown(f"**🏗️ {texts['structure_score_label']}**")
+        for factor in structure:
+            _factor_row(st, *factor)
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.markdown(f"**⚡ {texts['consumption_score_label']}**")
+        for factor in consumption:
+            _factor_row(st, *factor)
+
+    with st.expander(f"💡 {texts['strengths']} & {texts['areas_to_watch']}", expanded=False):
+        all_factors = [(name, data["normalized"]) for name, data, _ in structure + consumption]
+        col_str, col_weak = st.columns(2)
+        with col_str:
+            _insight_cards(st, f"✅ {texts['strengths']}",
+                           sorted((f for f in all_factors if f[1] >= 66), key=lambda f: -f[1]),
+                           "No standout strengths", "", "✓")
+        with col_weak:
+            _insight_cards(st, f"⚠️ {texts['areas_to_watch']}",
+                           sorted((f for f in all_factors if f[1] < 50), key=lambda f: f[1]),
+                           "No significant weaknesses", " warning", "!")
+
+
+RENDERERS = {"widgets": render_card_widgets, "html": render_card_html}
+
+
+def _cards_page():
+    """The script AppTest runs: every site card of the portfolio in session state"""
+    import streamlit as st
+
+    from solar21_core.bench_render import RENDERERS
+
+    state = st.session_state
+    render = RENDERERS[state["bench_renderer"]]
+    for position, (site, answers, result) in enumerate(zip(state["bench_sites"], state["bench_answers"],
+                                                           state["bench_results"])):
+        if position > 0:
+            st.markdown('<hr class="site-divider">', unsafe_allow_html=True)
+        render(site, answers, result, state["bench_model"], state["bench_lang"])
+
+
+# -------------------------------------------------------
+# MEASUREMENT
+# -------------------------------------------------------
+def _deltas(node):
+    """(delta count, serialized bytes) of an element tree"""
+    count = size = 0
+    proto = getattr(node, "proto", None)
+    if proto is not None:
+        count, size = 1, proto.ByteSize()
+    children = getattr(node, "children", None) or {}
+    for child in children.values() if isinstance(children, dict) else children:
+        child_count, child_size = _deltas(child)
+        count += child_count
+        size += child_size
+    return count, size
+
+
+def measure(model, renderer, sites, answers, lang="en"):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_function(_cards_page, default_timeout=120)
+    app.session_state["bench_renderer"] = renderer
+    app.session_state["bench_model"] = model
+    app.session_state["bench_lang"] = lang
+    app.session_state["bench_sites"] = sites
+    app.session_state["bench_answers"] = [answers[idx] for idx in range(len(sites))]
+    app.session_state["bench_results"] = [
+        model.score(answers[idx], compute_roof_score(site["roof_area"])) for idx, site in enumerate(sites)
+    ]
+    app.run()
+    if app.exception:
+        raise RuntimeError(f"{renderer}: {app.exception[0].value}")
+    # Second run, as a results-page rerun
+    start = time.perf_counter()
+    app.run()
+    seconds = time.perf_counter() - start
+    count, size = _deltas(app._tree)
+    return {"renderer": renderer, "sites": len(sites), "deltas": count, "bytes": size, "rerun_s": seconds}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="solar21-bench-render",
+        description="Compare deltas and bytes sent per rerun for both site card renderers.",
+    )
+    parser.add_argument("--sites", type=int, nargs="+", default=[1, 10],
+                        help="portfolio sizes to render (default: 1 10)")
+    parser.add_argument("--lang", default="en", help="language of the page (default: en)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    model = ScoringModel.from_active()
+    print(f"{'sites':>5}  {'renderer':8}  {'deltas':>6}  {'bytes':>8}  {'rerun':>8}")
+    for n_sites in args.sites:
+        sites, answers = portfolio(model, n_sites)
+        rows = [measure(model, renderer, sites, answers, args.lang) for renderer in RENDERERS]
+        for row in rows:
+            print(f"{row['sites']:>5}  {row['renderer']:8}  {row['deltas']:>6}  {row['bytes']:>8}  "
+                  f"{row['rerun_s'] * 1000:>6.0f}ms")
+        widgets, html = rows
+        print(f"{'':>5}  {'ratio':8}  {widgets['deltas'] / html['deltas']:>5.1f}x  "
+              f"{widgets['bytes'] / html['bytes']:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""Bounded LRU cache of per-site scoring results
+
+Entries are keyed by a stable hash of the site's roof score, its answers and
+the model version (a fingerprint of the questions and weights), so a changed
+configuration can never serve a stale score: old entries just stop matching
+and age out.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+DEFAULT_CACHE_SIZE = 4096
+
+
+def site_fingerprint(answers, roof_score, model_version):
+    """Stable hex digest of everything that determines a site's score"""
+    payload = json.dumps(
+        [model_version, roof_score, sorted(answers.items())],
+        ensure_ascii=False, separators=(",", ":"), default=str,
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def portfolio_fingerprint(roof_areas, answers_list, model_version):
+    """Stable hex digest of a whole portfolio's roof areas and answers under one model version"""
+    digest = hashlib.blake2b(model_version.encode("utf-8"), digest_size=16)
+    for roof_area, answers in zip(roof_areas, answers_list):
+        digest.update(json.dumps(
+            [roof_area, sorted(answers.items())], ensure_ascii=False, separators=(",", ":"), default=str,
+        ).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+class ScoreCache:
+    """LRU map of site fingerprints to ScoreResult, with hit/miss counters"""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def score(self, model, answers, roof_score):
+        """model.score(answers, roof_score), computed only on a cache miss
+
+        The ScoreResult is shared between hits; treat it as read-only.
+        """
+        key = site_fingerprint(answers, roof_score, model.version)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        result = model.score(answers, roof_score)
+        with self._lock:
+            self._entries[key] = result
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        """Drop every entry (the counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
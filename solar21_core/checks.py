@@ -0,0 +1,199 @@
+"""Automated checks of the guarantees the rest of the code relies on
+
+Each check returns a list of problems, empty when it passes. main runs
+them all (or the ones named with --only) and exits with status 1 if any
+failed, so a CI job or deploy script can run it before shipping.
+
+    python -m solar21_core.checks [--only store]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from .bench import ANSWER_KINDS, make_questions, make_sites
+from .config import DEFAULT_WEIGHTS
+from .scoring import SCORING_LANGUAGES, ScoringModel, compute_question_score, compute_roof_score
+from .store_stress import stress
+
+# Small enough to run on every change; store_stress is the long version
+STORE_WRITERS = 2
+STORE_READERS = 2
+STORE_WRITES = 5
+
+PARITY_SITES = 200
+PARITY_QUESTIONS = (6, 20)
+SEED = 21
+
+
+# -------------------------------------------------------
+# SYNTHETIC CONFIGURATIONS
+# -------------------------------------------------------
+def parity_configs(rng):
+    """(questions, weights) pairs: the defaults, then more questions with shuffled thresholds and random weights
+
+    Thresholds are shuffled and partly overlapping, so file order matters.
+    """
+    configs = []
+    for n_questions in PARITY_QUESTIONS:
+        configs.append((make_questions(n_questions), dict(DEFAULT_WEIGHTS)))
+        questions = make_questions(n_questions)
+        for question in questions:
+            if question["type"] == "slider":
+                question["scoring_thresholds"] = [
+                    {"min": rng.randint(0, 100), "score": rng.randint(0, 3)} for _ in range(rng.randint(2, 5))
+                ]
+        weights = {key: rng.choice((0, rng.random())) for key in DEFAULT_WEIGHTS}
+        weights.update({f"sub_{q['id']}": rng.random() for q in questions})
+        configs.append((questions, weights))
+    return configs
+
+
+def parity_sites(questions, rng, lang, kind):
+    """make_sites answers with about one answer in five left out"""
+    sites = make_sites(questions, PARITY_SITES, lang, kind, seed=rng.random())
+    return [({qid: value for qid, value in answers.items() if rng.random() > 0.2}, roof_score)
+            for answers, roof_score in sites]
+
+
+# -------------------------------------------------------
+# SCORING PARITY
+# -------------------------------------------------------
+def reference_final_score(questions, weights, answers, roof_score):
+    """The final score as the app computed it before the compiled model: one pass over the raw config"""
+    structure_weight = weights.get("structure", DEFAULT_WEIGHTS["structure"])
+    consumption_weight = weights.get("consumption", DEFAULT_WEIGHTS["consumption"])
+    total_weight = structure_weight + consumption_weight
+    if total_weight > 0:
+        structure_weight /= total_weight
+        consumption_weight /= total_weight
+    else:
+        structure_weight = 0.5
+        consumption_weight = 0.5
+
+    roof_norm = roof_score / 3 if roof_score > 0 else 0
+    structure_scores = [(roof_norm, weights.get("sub_roof", DEFAULT_WEIGHTS.get("sub_roof", 0.4)))]
+    consumption_scores = []
+    for question in questions:
+        answer_value = answers.get(question["id"])
+        if answer_value is None:
+            continue
+        max_score = question.get("max_score", 3)
+        score = compute_question_score(question, answer_value)
+        normalized = score / max_score if max_score > 0 else 0
+        sub_weight = weights.get(question.get("weight_key", f"sub_{question['id']}"), 0.2)
+        if question.get("category", "consumption") == "structure":
+            structure_scores.append((normalized, sub_weight))
+        else:
+            consumption_scores.append((normalized, sub_weight))
+
+    def category_score(scores):
+        total_sub_weight = sum(w for _, w in scores)
+        if not scores or total_sub_weight == 0:
+            return 0
+        return sum(score * (weight / total_sub_weight) for score, weight in scores)
+
+    final_score = structure_weight * category_score(structure_scores) + consumption_weight * category_score(consumption_scores)
+    return round(final_score * 100, 1)
+
+
+def check_compiled_parity():
+    """The compiled ScoringModel scores every site exactly like the uncompiled reference
+
+    Covers exact, truncated and unknown labels in every language, unanswered
+    questions, shuffled thresholds and answers given as option indices.
+    """
+    rng = random.Random(SEED)
+    problems = []
+    for questions, weights in parity_configs(rng):
+        model = ScoringModel(questions, weights)
+        for lang in SCORING_LANGUAGES:
+            for kind in ANSWER_KINDS:
+                for answers, roof_score in parity_sites(questions, rng, lang, kind):
+                    expected = reference_final_score(questions, weights, answers, roof_score)
+                    labels = model.score(answers, roof_score).final_score
+                    indices = model.score(_as_indices(model, answers), roof_score).final_score
+                    if labels != expected or (kind == "exact" and indices != expected):
+                        problems.append(f"{len(questions)} questions, {lang}/{kind}: reference {expected}, "
+                                        f"compiled {labels} (labels) / {indices} (indices)")
+    return problems
+
+
+def _as_indices(model, answers):
+    """The answers as the app stores them: option indices for select questions"""
+    return {qid: value if model.by_id[qid].kind == "slider" else model.by_id[qid].option_index(value)
+            for qid, value in answers.items()}
+
+
+def check_batch_parity():
+    """score_batch gives the site-by-site ScoreResult values bit for bit, for the same sites as above
+
+    Roof areas include missing and non-positive ones.
+    """
+    from .batch import encode_answers, score_batch
+
+    rng = random.Random(SEED)
+    problems = []
+    for questions, weights in parity_configs(rng):
+        model = ScoringModel(questions, weights)
+        for lang in SCORING_LANGUAGES:
+            for kind in ANSWER_KINDS:
+                sites = parity_sites(questions, rng, lang, kind)
+                answers_list = [answers for answers, _ in sites]
+                roof_areas = [rng.choice((float("nan"), 0.0, rng.uniform(-100, 2000))) for _ in sites]
+                batch = score_batch(roof_areas, encode_answers(answers_list, model), model)
+                for idx, (answers, area) in enumerate(zip(answers_list, roof_areas)):
+                    scalar = model.score(answers, compute_roof_score(None if area != area else area))
+                    got = (batch.final_scores[idx], batch.structure_totals[idx], batch.consumption_totals[idx])
+                    if got != (scalar.final_score, scalar.structure_total, scalar.consumption_total):
+                        problems.append(f"{len(questions)} questions, {lang}/{kind}, site {idx}: "
+                                        f"scalar {scalar.final_score}, batch {got[0]}")
+    return problems
+
+
+def check_store():
+    """Concurrent saves are atomic and locked: no torn reads, no lost writes"""
+    with tempfile.TemporaryDirectory() as directory:
+        final, _, errors = stress(Path(directory) / "weights.json", STORE_WRITERS, STORE_READERS, STORE_WRITES)
+    expected = STORE_WRITERS * STORE_WRITES
+    if final != expected:
+        errors.append(f"final version {final}, expected {expected}")
+    return errors
+
+
+CHECKS = {
+    "compiled": check_compiled_parity,
+    "batch": check_batch_parity,
+    "store": check_store,
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="solar21-checks",
+        description="Run the automated checks and exit with status 1 if any fails.",
+    )
+    parser.add_argument("--only", nargs="+", choices=sorted(CHECKS), help="run only these checks")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    failed = 0
+    for name in args.only or CHECKS:
+        start = time.perf_counter()
+        problems = CHECKS[name]()
+        seconds = time.perf_counter() - start
+        print(f"{name:8} {'FAIL' if problems else 'ok':4} {seconds:6.2f}s")
+        for problem in problems[:10]:
+            print(f"    {problem}")
+        failed += bool(problems)
+    print(f"solar21-checks: {len(args.only or CHECKS) - failed} passed, {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+"""solar21-score: score sites from JSONL or CSV without the Streamlit UI
+
+Reads sites (address, canton, roof data and answers) from a file or stdin
+and writes one JSON result per input row to stdout, in input order. Input
+is consumed in chunks, so memory stays bounded however large the file is;
+with --workers the chunks are scored in parallel processes.
+
+Input rows use the same columns as the CSV import of the app (see
+solar21_core.sites). JSONL records may also nest the answers under an
+"answers" object. Select answers are the option number (1, 2, ...) or the
+option text in any language, slider answers are numbers.
+
+    python -m solar21_core sites.csv > scores.jsonl
+    zcat crm_export.jsonl.gz | python -m solar21_core --workers 8 > scores.jsonl
+
+The repo has no packaging metadata, so no solar21-score script is
+installed; solar21-score is the program name in --help and messages.
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .config import QUESTIONS_FILE, WEIGHTS_FILE
+from .scoring import INTERPRETATION_TEXT, ScoringModel
+from .sites import normalize_column, validate_row
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+# -------------------------------------------------------
+# INPUT
+# -------------------------------------------------------
+def _cell(value):
+    return "" if value is None else str(value)
+
+
+def iter_jsonl_records(stream):
+    """Yield (line, raw JSON text); parsing happens in score_chunk so it runs in the workers"""
+    for line, text in enumerate(stream, start=1):
+        if text.strip():
+            yield line, text
+
+
+def parse_jsonl_record(text):
+    """Turn one JSONL line into a record with every value as a string, or an error message"""
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as exc:
+        return f"invalid JSON: {exc.msg}"
+    if not isinstance(data, dict):
+        return "expected a JSON object"
+    answers = data.pop("answers", None)
+    record = {normalize_column(key): _cell(value) for key, value in data.items()}
+    if isinstance(answers, dict):
+        record.update({key: _cell(value) for key, value in answers.items()})
+    return record
+
+
+def iter_csv_records(stream):
+    """Yield (line, record) for every CSV row; the delimiter (, or ;) is sniffed from the header"""
+    header = stream.readline().lstrip("\ufeff")
+    if not header:
+        return
+    delimiter = ";" if header.count(";") > header.count(",") else ","
+    reader = csv.reader(stream, delimiter=delimiter)
+    columns = [normalize_column(c) for c in next(csv.reader([header], delimiter=delimiter))]
+    for values in reader:
+        if not any(values):
+            continue
+        # reader.line_num counts from the line after the header
+        yield reader.line_num + 1, dict(zip(columns, values))
+
+
+def iter_records(stream, fmt):
+    if fmt == "auto":
+        first = stream.read(1)
+        while first and first.isspace():
+            first = stream.read(1)
+        fmt = "jsonl" if first == "{" else "csv"
+        stream = _Prepend(first, stream)
+    return iter_jsonl_records(stream) if fmt == "jsonl" else iter_csv_records(stream)
+
+
+class _Prepend(io.TextIOBase):
+    """A text stream with a few already-consumed characters pushed back"""
+
+    def __init__(self, head, stream):
+        self._head = head
+        self._stream = stream
+
+    def readline(self, size=-1):
+        line = self._head + self._stream.readline()
+        self._head = ""
+        return line
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.readline()
+        if not line:
+            raise StopIteration
+        return line
+
+
+# -------------------------------------------------------
+# SCORING (runs in worker processes with --workers)
+# -------------------------------------------------------
+_worker_model = None
+
+
+def _init_worker(questions_path, weights_path):
+    """Compile the model: the given files, or the active configuration version when none was given"""
+    global _worker_model
+    if questions_path is None and weights_path is None:
+        _worker_model = ScoringModel.from_active()
+    else:
+        _worker_model = ScoringModel.from_files(questions_path or QUESTIONS_FILE, weights_path or WEIGHTS_FILE)
+
+
+def score_chunk(chunk, model=None):
+    """Validate and score a list of (line, record); returns one output dict per row
+
+    A record is a dict of strings (CSV) or a raw JSONL line.
+    """
+    import numpy as np
+
+    from .batch import BAND_NAMES, score_batch
+
+    model = model or _worker_model
+    outputs = [None] * len(chunk)
+    valid = []
+    for pos, (line, record) in enumerate(chunk):
+        if isinstance(record, str):
+            record = parse_jsonl_record(record)
+        if isinstance(record, str):
+            outputs[pos] = {"line": line, "errors": [record]}
+            continue
+        row, errors = validate_row(line, record, model)
+        if row is None:
+            outputs[pos] = {"line": line, "address": record.get("address", ""), "errors": errors}
+        else:
+            valid.append((pos, row))
+
+    if valid:
+        matrix = np.full((len(valid), len(model.compiled)), np.nan)
+        for i, (_, row) in enumerate(valid):
+            for col, cq in enumerate(model.compiled):
+                value = row.answers.get(cq.id)
+                if value is not None:
+                    matrix[i, col] = value
+        roof_areas = [np.nan if row.site["roof_area"] is None else row.site["roof_area"] for _, row in valid]
+        result = score_batch(roof_areas, matrix, model)
+
+        for i, (pos, row) in enumerate(valid):
+            band = BAND_NAMES[result.bands[i]]
+            outputs[pos] = {
+                "line": row.line,
+                "address": row.site["address"],
+                "canton": row.site["canton"],
+                "final_score": float(result.final_scores[i]),
+                "band": band,
+                "interpretation": INTERPRETATION_TEXT[band]["en"],
+                "structure_total": float(result.structure_totals[i]),
+                "consumption_total": float(result.consumption_totals[i]),
+                "roof_score": int(result.roof_scores[i]),
+            }
+    return outputs
+
+
+def render_chunk(chunk):
+    """Score a chunk and serialize it to JSONL (done in the worker to keep the parent light)
+
+    Returns (text, rows, rows with errors).
+    """
+    outputs = score_chunk(chunk)
+    text = "".join(json.dumps(output, ensure_ascii=False) + "\n" for output in outputs)
+    return text, len(outputs), sum("errors" in output for output in outputs)
+
+
+def _chunks(records, size):
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def score_stream(records, model_paths, workers=1, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield render_chunk results in input order, keeping at most a few chunks in flight"""
+    if workers <= 1:
+        _init_worker(*model_paths)
+        for chunk in _chunks(records, chunk_size):
+            yield render_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=model_paths) as pool:
+        pending = deque()
+        for chunk in _chunks(records, chunk_size):
+            pending.append(pool.submit(render_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+# -------------------------------------------------------
+# ENTRY POINT
+# -------------------------------------------------------
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="solar21-score",
+        description="Score Solar21 candidate sites from JSONL or CSV and stream JSONL results.",
+    )
+    parser.add_argument("input", nargs="?", default="-", help="input file (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("--format", choices=["auto", "jsonl", "csv"], default="auto",
+                        help="input format (default: from the file extension, or sniffed)")
+    parser.add_argument("--questions",
+                        help=f"questions file to score with (default: the active version of {QUESTIONS_FILE})")
+    parser.add_argument("--weights",
+                        help=f"weights file to score with (default: the active version of {WEIGHTS_FILE})")
+    parser.add_argument("--workers", type=int, default=1, help="score chunks in this many processes")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows per chunk")
+    return parser
+
+
+def _format_from_name(path):
+    name = path.lower()
+    if name.endswith((".csv", ".txt")):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    return "auto"
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    fmt = args.format
+    if fmt == "auto" and args.input != "-":
+        fmt = _format_from_name(args.input)
+
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8-sig", newline="")
+    target = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    n_rows = n_errors = 0
+    try:
+        records = iter_records(source, fmt)
+        for text, rows, errors in score_stream(records, (args.questions, args.weights), args.workers, args.chunk_size):
+            target.write(text)
+            n_rows += rows
+            n_errors += errors
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    print(f"solar21-score: {n_rows} rows, {n_rows - n_errors} scored, {n_errors} with errors", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""Questions and weights configuration: defaults, loading and saving
+
+Saves go through solar21_core.store (atomic rename, file lock, version
+number), so readers never see a half-written file.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from .store import read_json, save_json
+
+# -------------------------------------------------------
+# WEIGHTS FILE MANAGEMENT
+# -------------------------------------------------------
+WEIGHTS_FILE = Path("weights.json")
+DEFAULT_WEIGHTS = {
+    "structure": 0.40,
+    "consumption": 0.60,
+    # Sub-weights for structure (must sum to 1.0)
+    "sub_roof": 0.40,
+    "sub_owner": 0.30,
+    "sub_esg": 0.30,
+    # Sub-weights for consumption (must sum to 1.0)
+    "sub_spend": 0.30,
+    "sub_daytime": 0.25,
+    "sub_season": 0.25,
+    "sub_loads": 0.20,
+}
+
+
+def normalize_weights(data):
+    """Weights from a weights.json payload, each group of weights normalized to sum to 1"""
+    structure = float(data.get("structure", DEFAULT_WEIGHTS["structure"]))
+    consumption = float(data.get("consumption", DEFAULT_WEIGHTS["consumption"]))
+    total = structure + consumption
+
+    if total > 0:
+        weights = {
+            "structure": structure / total,
+            "consumption": consumption / total,
+        }
+    else:
+        weights = {
+            "structure": DEFAULT_WEIGHTS["structure"],
+            "consumption": DEFAULT_WEIGHTS["consumption"],
+        }
+
+    # Load sub-weights for structure
+    sub_roof = float(data.get("sub_roof", DEFAULT_WEIGHTS["sub_roof"]))
+    sub_owner = float(data.get("sub_owner", DEFAULT_WEIGHTS["sub_owner"]))
+    sub_esg = float(data.get("sub_esg", DEFAULT_WEIGHTS["sub_esg"]))
+    struct_total = sub_roof + sub_owner + sub_esg
+    if struct_total > 0:
+        weights["sub_roof"] = sub_roof / struct_total
+        weights["sub_owner"] = sub_owner / struct_total
+        weights["sub_esg"] = sub_esg / struct_total
+    else:
+        weights["sub_roof"] = DEFAULT_WEIGHTS["sub_roof"]
+        weights["sub_owner"] = DEFAULT_WEIGHTS["sub_owner"]
+        weights["sub_esg"] = DEFAULT_WEIGHTS["sub_esg"]
+
+    # Load sub-weights for consumption
+    sub_spend = float(data.get("sub_spend", DEFAULT_WEIGHTS["sub_spend"]))
+    sub_daytime = float(data.get("sub_daytime", DEFAULT_WEIGHTS["sub_daytime"]))
+    sub_season = float(data.get("sub_season", DEFAULT_WEIGHTS["sub_season"]))
+    sub_loads = float(data.get("sub_loads", DEFAULT_WEIGHTS["sub_loads"]))
+    cons_total = sub_spend + sub_daytime + sub_season + sub_loads
+    if cons_total > 0:
+        weights["sub_spend"] = sub_spend / cons_total
+        weights["sub_daytime"] = sub_daytime / cons_total
+        weights["sub_season"] = sub_season / cons_total
+        weights["sub_loads"] = sub_loads / cons_total
+    else:
+        weights["sub_spend"] = DEFAULT_WEIGHTS["sub_spend"]
+        weights["sub_daytime"] = DEFAULT_WEIGHTS["sub_daytime"]
+        weights["sub_season"] = DEFAULT_WEIGHTS["sub_season"]
+        weights["sub_loads"] = DEFAULT_WEIGHTS["sub_loads"]
+
+    # Weights of added questions (sub_<id>) are kept as saved; the app normalizes them on save
+    for key, value in data.items():
+        if key.startswith("sub_") and key not in weights:
+            weights[key] = float(value)
+
+    return weights
+
+
+def load_weights(path=WEIGHTS_FILE):
+    """Load weights.json, normalizing each group of weights to sum to 1"""
+    path = Path(path)
+    if path.exists():
+        try:
+            return normalize_weights(read_json(path))
+        except (OSError, ValueError, TypeError, AttributeError):
+            # Unreadable or malformed file (saves are atomic, so never a partial one)
+            pass
+
+    return DEFAULT_WEIGHTS.copy()
+
+
+def save_weights(weights, path=WEIGHTS_FILE):
+    """Save weights to weights.json file; returns the file's new version number"""
+    return save_json(path, weights, indent=2)
+
+
+# -------------------------------------------------------
+# QUESTIONS FILE MANAGEMENT
+# -------------------------------------------------------
+QUESTIONS_FILE = Path("questions.json")
+
+DEFAULT_QUESTIONS = [
+    {
+        "id": "owner",
+        "category": "structure",
+        "type": "select",
+        "weight_key": "sub_owner",
+        "max_score": 3,
+        "topic": {"en": "Owner type", "fr": "Type de propriétaire", "de": "Eigentümertyp"},
+        "labels": {"en": "Who owns this site?", "fr": "Qui est propriétaire de ce site ?", "de": "Wer ist Eigentümer dieses Standorts?"},
+        "help": {"en": "This helps us understand how easy it is for the owner to finance a solar project.", "fr": "Cela nous aide à comprendre la facilité de financement d'un projet solaire pour le propriétaire.", "de": "Dies hilft uns zu verstehen, wie einfach es für den Eigentümer ist, ein Solarprojekt zu finanzieren."},
+        "options": [
+            {"score": 3, "labels": {"en": "Public entity or large institutional owner", "fr": "Entité publique ou grand propriétaire institutionnel", "de": "Öffentliche Einrichtung oder großer institutioneller Eigentümer"}},
+            {"score": 2, "labels": {"en": "Standard commercial owner", "fr": "Propriétaire commercial standard", "de": "Standard-Gewerbeinhaber"}},
+            {"score": 1, "labels": {"en": "Private individual or small SME", "fr": "Particulier ou petite PME", "de": "Privatperson oder kleines KMU"}}
+        ]
+    },
+    {
+        "id": "esg",
+        "category": "structure",
+        "type": "select",
+        "weight_key": "sub_esg",
+        "max_score": 3,
+        "topic": {"en": "ESG engagement", "fr": "Engagement ESG", "de": "ESG-Engagement"},
+        "labels": {"en": "Is the owner visibly engaged in sustainability topics?", "fr": "Le propriétaire est-il visiblement engagé dans la durabilité ?", "de": "Ist der Eigentümer sichtbar im Nachhaltigkeitsbereich engagiert?"},
+        "help": {"en": "This helps estimate how receptive they are to solar solutions.", "fr": "Cela aide à estimer leur réceptivité aux solutions solaires.", "de": "Dies hilft einzuschätzen, wie aufgeschlossen sie für Solarlösungen sind."},
+        "options": [
+            {"score": 3, "labels": {"en": "Yes — sustainability is clearly part of their identity", "fr": "Oui — la durabilité fait clairement partie de leur identité", "de": "Ja — Nachhaltigkeit ist eindeutig Teil ihrer Identität"}},
+            {"score": 2, "labels": {"en": "Not sure — no clear signal", "fr": "Incertain — aucun signal clair", "de": "Unsicher — kein klares Signal"}},
+            {"score": 1, "labels": {"en": "No — sustainability is not a visible priority", "fr": "Non — la durabilité n'est pas une priorité visible", "de": "Nein — Nachhaltigkeit ist keine sichtbare Priorität"}}
+        ]
+    },
+    {
+        "id": "daytime",
+        "category": "consumption",
+        "type": "slider",
+        "weight_key": "sub_daytime",
+        "max_score": 3,
+        "min_value": 0,
+        "max_value": 100,
+        "default_value": 60,
+        "step": 1,
+        "unit": "%",
+        "topic": {"en": "Daytime consumption", "fr": "Consommation diurne", "de": "Tagesverbrauch"},
+        "labels": {"en": "What share of the site's electricity is used during daytime (08:00–18:00)?", "fr": "Quelle part de l'électricité du site est utilisée en journée (08h00–18h00) ?", "de": "Welcher Anteil des Stroms wird tagsüber (08:00–18:00) verbraucht?"},
+        "help": {"en": "Daytime consumption increases the amount of solar electricity the site can use directly.", "fr": "La consommation diurne augmente la part d'électricité solaire utilisée directement.", "de": "Tagesverbrauch erhöht den Anteil an direkt genutztem Solarstrom."},
+        "scoring_thresholds": [{"min": 75, "score": 3}, {"min": 50, "score": 2}, {"min": 25, "score": 1}, {"min": 0, "score": 0}]
+    },
+    {
+        "id": "spend",
+        "category": "consumption",
+        "type": "select",
+        "weight_key": "sub_spend",
+        "max_score": 4,
+        "display_horizontal": True,
+        "topic": {"en": "Electricity spend", "fr": "Dépenses d'électricité", "de": "Stromkosten"},
+        "labels": {"en": "What is the site's annual electricity cost (CHF)?", "fr": "Quel est le coût annuel d'électricité du site (CHF) ?", "de": "Was sind die jährlichen Stromkosten des Standorts (CHF)?"},
+        "help": {"en": "This indicates the financial importance of energy decisions and the potential for savings.", "fr": "Cela indique l'importance financière des décisions énergétiques et le potentiel d'économies.", "de": "Dies zeigt die finanzielle Bedeutung von Energieentscheidungen und das Einsparpotenzial."},
+        "options": [
+            {"score": 1, "labels": {"en": "Below 100k CHF", "fr": "Moins de 100k CHF", "de": "Unter 100k CHF"}},
+            {"score": 2, "labels": {"en": "100k — 300k CHF", "fr": "100k — 300k CHF", "de": "100k — 300k CHF"}},
+            {"score": 3, "labels": {"en": "300k — 800k CHF", "fr": "300k — 800k CHF", "de": "300k — 800k CHF"}},
+            {"score": 4, "labels": {"en": "Above 800k CHF", "fr": "Plus de 800k CHF", "de": "Über 800k CHF"}}
+        ]
+    },
+    {
+        "id": "season",
+        "category": "consumption",
+        "type": "select",
+        "weight_key": "sub_season",
+        "max_score": 3,
+        "topic": {"en": "Seasonal stability", "fr": "Stabilité saisonnière", "de": "Saisonale Stabilität"},
+        "labels": {"en": "How stable is the site's electricity consumption throughout the year?", "fr": "Quelle est la stabilité de la consommation électrique tout au long de l'année ?", "de": "Wie stabil ist der Stromverbrauch des Standorts über das Jahr?"},
+        "help": {"en": "High seasonality makes it harder to match solar production with consumption.", "fr": "Une forte saisonnalité rend plus difficile l'adéquation entre production solaire et consommation.", "de": "Hohe Saisonalität erschwert die Anpassung von Solarproduktion und Verbrauch."},
+        "options": [
+            {"score": 3, "labels": {"en": "Low seasonal variation (±10%)", "fr": "Faible variation saisonnière (±10%)", "de": "Geringe saisonale Schwankung (±10%)"}},
+            {"score": 2, "labels": {"en": "Moderate variation (±10–25%)", "fr": "Variation modérée (±10–25%)", "de": "Mäßige Schwankung (±10–25%)"}},
+            {"score": 1, "labels": {"en": "High variation (>25%)", "fr": "Forte variation (>25%)", "de": "Hohe Schwankung (>25%)"}}
+        ]
+    },
+    {
+        "id": "loads",
+        "category": "consumption",
+        "type": "select",
+        "weight_key": "sub_loads",
+        "max_score": 3,
+        "display_horizontal": True,
+        "topic": {"en": "24/7 loads", "fr": "Charges 24/7", "de": "24/7-Lasten"},
+        "labels": {"en": "Does the site operate equipment that runs 24/7?", "fr": "Le site exploite-t-il des équipements fonctionnant 24h/24 7j/7 ?", "de": "Betreibt der Standort Geräte, die 24/7 laufen?"},
+        "help": {"en": "Constant loads increase the share of solar energy that can be consumed directly.", "fr": "Les charges constantes augmentent la part d'énergie solaire consommée directement.", "de": "Konstante Lasten erhöhen den Anteil direkt verbrauchter Solarenergie."},
+        "options": [
+            {"score": 3, "labels": {"en": "Yes — important 24/7 loads", "fr": "Oui — charges importantes 24h/24 7j/7", "de": "Ja — wichtige 24/7-Lasten"}},
+            {"score": 1, "labels": {"en": "No — mainly daytime or irregular loads", "fr": "Non — principalement charges diurnes ou irrégulières", "de": "Nein — hauptsächlich Tages- oder unregelmäßige Lasten"}}
+        ]
+    }
+]
+
+
+def load_questions(path=QUESTIONS_FILE):
+    """Load questions from questions.json file"""
+    path = Path(path)
+    if path.exists():
+        try:
+            return read_json(path).get("questions", DEFAULT_QUESTIONS)
+        except (OSError, ValueError, AttributeError):
+            pass
+    return DEFAULT_QUESTIONS.copy()
+
+
+def save_questions(questions, path=QUESTIONS_FILE):
+    """Save questions to questions.json file; returns the file's new version number"""
+    return save_json(path, {"questions": questions}, indent=2, ensure_ascii=False)
+
+
+def config_fingerprint(questions, weights):
+    """Short stable hash of a questions/weights configuration"""
+    payload = json.dumps({"questions": questions, "weights": weights}, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
@@ -0,0 +1,201 @@
+"""Evaluation history in a local SQLite database
+
+Every completed evaluation (site, roof data, raw answers, per-factor
+scores, final score, model version) is kept in one table with indexes on
+address, canton, final score and time, so tens of thousands of past
+evaluations can be filtered in milliseconds. The database runs in WAL
+mode: readers (e.g. an analyst's query) never block the app's writes, and
+each results page is written as one batch in a single transaction.
+
+    python -m solar21_core.history --canton ZH --min-score 70 --best --limit 20
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+from .cache import site_fingerprint
+
+HISTORY_DB = Path("evaluations.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS evaluations (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    fingerprint TEXT NOT NULL,
+    address TEXT NOT NULL,
+    canton TEXT NOT NULL DEFAULT '',
+    roof_area REAL,
+    roof_pitch REAL,
+    roof_orientation REAL,
+    roof_score INTEGER NOT NULL,
+    answers TEXT NOT NULL,
+    factors TEXT NOT NULL,
+    structure_total REAL NOT NULL,
+    consumption_total REAL NOT NULL,
+    final_score REAL NOT NULL,
+    model_version TEXT NOT NULL,
+    lang TEXT NOT NULL DEFAULT 'en'
+);
+CREATE INDEX IF NOT EXISTS evaluations_address ON evaluations (address);
+CREATE INDEX IF NOT EXISTS evaluations_canton_score ON evaluations (canton, final_score);
+CREATE INDEX IF NOT EXISTS evaluations_score ON evaluations (final_score);
+CREATE INDEX IF NOT EXISTS evaluations_created_at ON evaluations (created_at);
+"""
+
+_COLUMNS = (
+    "created_at", "fingerprint", "address", "canton", "roof_area", "roof_pitch", "roof_orientation",
+    "roof_score", "answers", "factors", "structure_total", "consumption_total", "final_score",
+    "model_version", "lang",
+)
+_INSERT = f"INSERT INTO evaluations ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+
+
+def evaluation_row(site, answers, roof_score, result, model_version, lang="en", created_at=None):
+    """One evaluations row (a tuple in _COLUMNS order) for a scored site"""
+    return (
+        time.time() if created_at is None else created_at,
+        site_fingerprint(answers, roof_score, model_version),
+        site.get("address", ""),
+        site.get("canton", "") or "",
+        site.get("roof_area"),
+        site.get("roof_pitch"),
+        site.get("roof_orientation"),
+        roof_score,
+        json.dumps(answers, ensure_ascii=False, separators=(",", ":")),
+        json.dumps(result.factors, separators=(",", ":")),
+        result.structure_total,
+        result.consumption_total,
+        result.final_score,
+        model_version,
+        lang,
+    )
+
+
+class EvaluationHistory:
+    """Thread-safe handle on the evaluations database (one connection, shared by all sessions)"""
+
+    def __init__(self, path=HISTORY_DB):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # In WAL mode NORMAL still never corrupts the database; a power cut may lose the last commit
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def record(self, rows):
+        """Insert evaluation_row() tuples in one transaction; returns how many"""
+        rows = list(rows)
+        if rows:
+            with self._lock, self._conn:
+                self._conn.executemany(_INSERT, rows)
+        return len(rows)
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+
+    def latest_id(self):
+        """Id of the newest evaluation (0 if there is none); changes whenever one is recorded"""
+        with self._lock:
+            return self._conn.execute("SELECT MAX(id) FROM evaluations").fetchone()[0] or 0
+
+    def latest_per_address(self, limit=5000):
+        """The newest evaluation of each address (up to limit addresses, most recent first), as dicts
+
+        The real portfolio evaluated so far, e.g. to preview weight changes on.
+        """
+        query = ("SELECT * FROM evaluations WHERE id IN (SELECT MAX(id) FROM evaluations GROUP BY address) "
+                 "ORDER BY created_at DESC LIMIT ?")
+        with self._lock:
+            rows = self._conn.execute(query, (limit,)).fetchall()
+        return [_as_dict(row) for row in rows]
+
+    def search(self, address=None, canton=None, min_score=None, max_score=None, since=None, until=None,
+               best_first=False, limit=100):
+        """Evaluations matching every given filter as dicts, newest (or best_first, highest score) first
+
+        address matches as a prefix (case-sensitive, so the address index is used);
+        since/until are Unix timestamps.
+        """
+        clauses, params = [], []
+        if address:
+            # A range instead of LIKE, which SQLite cannot serve from a case-sensitive index
+            clauses.append("address >= ? AND address < ?")
+            params += [address, address + "\U0010ffff"]
+        if canton:
+            clauses.append("canton = ?")
+            params.append(canton)
+        if min_score is not None:
+            clauses.append("final_score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            clauses.append("final_score <= ?")
+            params.append(max_score)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = "final_score DESC, created_at DESC" if best_first else "created_at DESC"
+        query = f"SELECT * FROM evaluations {where} ORDER BY {order} LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(query, [*params, limit]).fetchall()
+        return [_as_dict(row) for row in rows]
+
+
+def _as_dict(row):
+    record = dict(row)
+    record["answers"] = json.loads(record["answers"])
+    record["factors"] = json.loads(record["factors"])
+    return record
+
+
+# -------------------------------------------------------
+# ENTRY POINT
+# -------------------------------------------------------
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="solar21-history",
+        description="Query the evaluation history; prints one JSON object per evaluation, newest first.",
+    )
+    parser.add_argument("--db", default=str(HISTORY_DB), help=f"database file (default: {HISTORY_DB})")
+    parser.add_argument("--address", help="address prefix")
+    parser.add_argument("--canton", help="canton code, e.g. ZH")
+    parser.add_argument("--min-score", type=float)
+    parser.add_argument("--max-score", type=float)
+    parser.add_argument("--days", type=float, help="only evaluations from the last N days")
+    parser.add_argument("--best", action="store_true", help="highest scores first instead of newest first")
+    parser.add_argument("--limit", type=int, default=100)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not Path(args.db).exists():
+        print(f"solar21-history: {args.db} does not exist", file=sys.stderr)
+        return 1
+    history = EvaluationHistory(args.db)
+    since = time.time() - args.days * 86400 if args.days else None
+    for record in history.search(args.address, args.canton, args.min_score, args.max_score, since=since,
+                                 best_first=args.best, limit=args.limit):
+        print(json.dumps(record, ensure_ascii=False))
+    history.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""Translation catalogs for the app's texts and the configured questions
+
+UI texts live in locales/<lang>.json as flat key -> text mappings. A
+language is read the first time it is asked for and compiled once per
+process: English fills any key the language lacks, so lookups never need
+a fallback, and strings are interned because every session shares them.
+
+    from solar21_core.i18n import TEXT, question_texts
+
+    TEXT["fr"]["continue"]                        # "Continuer →"
+    question_texts(model, "de")["owner.label"]
+
+Question texts (labels, help, topics, option labels) are compiled the same
+way per scoring model version and language, under flat keys
+"<question id>.label", ".help", ".topic" and ".options" (a tuple).
+
+    python -m solar21_core.i18n    # report missing translations (exit code 1 if any)
+"""
+
+import json
+import sys
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+
+from .config import QUESTIONS_FILE, load_questions
+
+LOCALES_DIR = Path(__file__).with_name("locales")
+LANGUAGES = ("en", "fr", "de")
+FALLBACK_LANGUAGE = "en"
+
+
+def _read_locale(lang):
+    path = LOCALES_DIR / f"{lang}.json"
+    if not path.is_file():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+@lru_cache(maxsize=None)
+def catalog(lang):
+    """Read-only key -> text mapping of one language, with English filled in for missing keys"""
+    texts = _read_locale(FALLBACK_LANGUAGE)
+    if lang != FALLBACK_LANGUAGE:
+        texts.update((key, text) for key, text in _read_locale(lang).items() if text)
+    return MappingProxyType({sys.intern(key): sys.intern(text) for key, text in texts.items()})
+
+
+class Catalogs:
+    """TEXT[lang][key]: catalogs by language, each loaded on first use"""
+
+    def __getitem__(self, lang):
+        return catalog(lang)
+
+
+TEXT = Catalogs()
+
+
+# -------------------------------------------------------
+# QUESTION TEXTS
+# -------------------------------------------------------
+QUESTION_FIELDS = ("labels", "help", "topic")
+_QUESTION_KEYS = {"labels": "label", "help": "help", "topic": "topic"}
+QUESTION_CATALOG_SIZE = 32
+
+_question_catalogs = OrderedDict()
+_question_catalogs_lock = threading.Lock()
+
+
+def _pick(texts, lang, default=""):
+    texts = texts or {}
+    return sys.intern(texts.get(lang) or texts.get(FALLBACK_LANGUAGE) or default)
+
+
+def compile_question_texts(questions, lang):
+    """Flat key -> text mapping for one language (English where a translation is missing)"""
+    compiled = {}
+    for question in questions:
+        qid = question["id"]
+        for field in QUESTION_FIELDS:
+            compiled[f"{qid}.{_QUESTION_KEYS[field]}"] = _pick(question.get(field), lang, qid if field == "topic" else "")
+        compiled[f"{qid}.options"] = tuple(
+            _pick(option.get("labels"), lang) for option in question.get("options", [])
+        )
+    return MappingProxyType(compiled)
+
+
+def question_texts(model, lang):
+    """Question texts of a ScoringModel in one language, compiled once per model version"""
+    key = (model.version, lang)
+    with _question_catalogs_lock:
+        texts = _question_catalogs.get(key)
+        if texts is not None:
+            _question_catalogs.move_to_end(key)
+            return texts
+    texts = compile_question_texts(model.questions, lang)
+    with _question_catalogs_lock:
+        _question_catalogs[key] = texts
+        while len(_question_catalogs) > QUESTION_CATALOG_SIZE:
+            _question_catalogs.popitem(last=False)
+    return texts
+
+
+# -------------------------------------------------------
+# MISSING TRANSLATIONS
+# -------------------------------------------------------
+def missing_translations(questions=None, languages=LANGUAGES):
+    """(language, key) for every UI text and question text that is not translated
+
+    Question texts are reported as "questions:<id>.label" etc., options as
+    "questions:<id>.options.<n>".
+    """
+    missing = []
+    reference = _read_locale(FALLBACK_LANGUAGE)
+    for lang in languages:
+        texts = _read_locale(lang)
+        missing.extend((lang, key) for key in reference if not texts.get(key))
+    for question in questions or []:
+        qid = question["id"]
+        for lang in languages:
+            for field in QUESTION_FIELDS:
+                if question.get(field) and not question[field].get(lang):
+                    missing.append((lang, f"questions:{qid}.{_QUESTION_KEYS[field]}"))
+            for n, option in enumerate(question.get("options", []), start=1):
+                if not option.get("labels", {}).get(lang):
+                    missing.append((lang, f"questions:{qid}.options.{n}"))
+    return missing
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    questions = load_questions(argv[0] if argv else QUESTIONS_FILE)
+    missing = missing_translations(questions)
+    for lang, key in missing:
+        print(f"{lang}: {key}")
+    print(f"solar21-i18n: {len(missing)} missing translation(s)", file=sys.stderr)
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
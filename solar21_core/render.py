@@ -0,0 +1,172 @@
+"""HTML rendering of a site's result card (hero score, categories, factors, strengths)
+
+The whole card is one HTML fragment, so the app sends it as a single
+st.markdown element instead of dozens of markdown, caption, column and
+expander elements. The collapsible sections are plain <details> blocks.
+Templates are parsed once per process; rendering is string substitution,
+with labels from the compiled translation catalogs (solar21_core.i18n), so
+answers stored as option indices get their label in the page language.
+"""
+
+from html import escape
+from string import Template
+
+from .i18n import TEXT, question_texts
+from .scoring import get_score_interpretation
+
+# No blank lines and no indentation: Markdown would end the HTML block
+# or turn indented lines into code
+_CARD = Template(
+    '<div class="site-card">'
+    '<h3>📍 $address ($canton)</h3>'
+    '<div class="score-hero">'
+    '<p class="score-hero-value" style="color: $score_color !important;">$score</p>'
+    '<p class="score-hero-label">$score_label / 100</p>'
+    '<p class="score-hero-interpretation">$emoji $interpretation</p>'
+    '<p class="score-hero-recommendation">$recommendation</p>'
+    '</div>'
+    '<div class="site-card-columns">$categories</div>'
+    '<details class="site-card-section" open><summary>📊 $factor_analysis</summary>$factors</details>'
+    '<details class="site-card-section"><summary>💡 $strengths &amp; $areas_to_watch</summary>'
+    '<div class="site-card-columns">$insights</div></details>'
+    '</div>'
+)
+_CATEGORY = Template(
+    '<div class="category-card">'
+    '<div class="category-header">'
+    '<span class="category-title">$icon $title</span>'
+    '<span class="category-score">$score%</span>'
+    '</div>'
+    '<div class="progress-bar-container">'
+    '<div class="progress-bar-fill $bar_class" style="width: $score%;"></div>'
+    '</div>'
+    '<small style="color: #888;">Weight: $weight%</small>'
+    '</div>'
+)
+_FACTOR = Template(
+    '<div class="factor-row">'
+    '<span class="factor-name">$name</span>'
+    '<div class="factor-bar"><div class="progress-bar-container">'
+    '<div class="progress-bar-fill $bar_class" style="width: $normalized%;"></div>'
+    '</div></div>'
+    '<span class="factor-score">$score/$max</span>'
+    '</div>'
+    '<p class="factor-answer">↳ $value</p>'
+)
+_INSIGHT = Template('<div class="insight-card$extra"><span class="insight-icon">$icon</span>$name ($score%)</div>')
+
+
+def score_color(score):
+    return "#00FF40" if score >= 70 else "#FFD700" if score >= 55 else "#FFA500" if score >= 40 else "#FF6B6B"
+
+
+def _category_class(score):
+    return ("progress-green" if score >= 70 else "progress-yellow" if score >= 50
+            else "progress-orange" if score >= 30 else "progress-red")
+
+
+def _factor_class(normalized):
+    return "progress-green" if normalized >= 66 else "progress-yellow" if normalized >= 33 else "progress-red"
+
+
+def answer_text(question, value, options):
+    """The answer as shown on a result card; options are the question's option labels in the page language
+
+    Select answers are option indices; labels are only looked up here.
+    """
+    if question.get("type") == "slider":
+        return f"{value}%"
+    if isinstance(value, int) and 0 <= value < len(options):
+        value = options[value]
+    if isinstance(value, str) and "—" in value:
+        return value.split("—")[0].strip()
+    return value
+
+
+def site_factors(site, answers, details, model, lang):
+    """(structure, consumption) lists of (topic, score details, answer shown) for one site"""
+    qtexts = question_texts(model, lang)
+    structure = [(TEXT[lang]["roof_size_topic"], details["roof"], f"{site.get('roof_area', 'N/A')} m²")]
+    consumption = []
+    for question in model.questions:
+        qid = question["id"]
+        if qid not in details:
+            continue
+        factor = (qtexts[f"{qid}.topic"], details[qid],
+                  answer_text(question, answers.get(qid, ""), qtexts[f"{qid}.options"]))
+        if question.get("category") == "structure":
+            structure.append(factor)
+        elif question.get("category") == "consumption":
+            consumption.append(factor)
+    return structure, consumption
+
+
+def _factor_rows(factors):
+    return "".join(
+        _FACTOR.substitute(
+            name=escape(str(name)), bar_class=_factor_class(data["normalized"]), normalized=data["normalized"],
+            score=data["score"], max=data["max"], value=escape(str(value)),
+        )
+        for name, data, value in factors
+    )
+
+
+def _insights(factors, title, empty, keep, reverse, icon, extra):
+    chosen = sorted(((name, data["normalized"]) for name, data, _ in factors if keep(data["normalized"])),
+                    key=lambda factor: factor[1], reverse=reverse)
+    if chosen:
+        cards = "".join(
+            _INSIGHT.substitute(extra=extra, icon=icon, name=escape(str(name)), score=round(score))
+            for name, score in chosen
+        )
+    else:
+        cards = f'<p class="factor-answer">{empty}</p>'
+    return f"<div><p><strong>{title}</strong></p>{cards}</div>"
+
+
+def site_card_html(site, answers, result, model, lang):
+    """The complete result card of one site (a ScoreResult of model) as a single HTML string"""
+    texts = TEXT[lang]
+    final_score = result.final_score
+    details = result.details()
+    interpretation, recommendation, emoji = get_score_interpretation(final_score, lang)
+    structure, consumption = site_factors(site, answers, details, model, lang)
+
+    categories = "".join(
+        _CATEGORY.substitute(
+            icon=icon, title=texts[label], score=round(details[total], 1),
+            bar_class=_category_class(round(details[total], 1)), weight=round(details[weight] * 100),
+        )
+        for icon, label, total, weight in (
+            ("🏗️", "structure_score_label", "structure_total", "structure_weight"),
+            ("⚡", "consumption_score_label", "consumption_total", "consumption_weight"),
+        )
+    )
+    factors = (
+        f"<p><strong>🏗️ {texts['structure_score_label']}</strong></p>{_factor_rows(structure)}"
+        f"<p><strong>⚡ {texts['consumption_score_label']}</strong></p>{_factor_rows(consumption)}"
+    )
+    all_factors = structure + consumption
+    insights = (
+        _insights(all_factors, f"✅ {texts['strengths']}", "No standout strengths",
+                  lambda score: score >= 66, True, "✓", "")
+        + _insights(all_factors, f"⚠️ {texts['areas_to_watch']}", "No significant weaknesses",
+                    lambda score: score < 50, False, "!", " warning")
+    )
+
+    return _CARD.substitute(
+        address=escape(str(site.get("address", ""))),
+        canton=escape(str(site.get("canton", ""))),
+        score=final_score,
+        score_color=score_color(final_score),
+        score_label=texts["score_label"],
+        emoji=emoji,
+        interpretation=interpretation,
+        recommendation=recommendation,
+        categories=categories,
+        factor_analysis=texts["factor_analysis"],
+        factors=factors,
+        strengths=texts["strengths"],
+        areas_to_watch=texts["areas_to_watch"],
+        insights=insights,
+    )
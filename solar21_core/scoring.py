@@ -0,0 +1,453 @@
+"""Site scoring: roof score, question scores, compiled model and interpretation"""
+
+import bisect
+import numbers
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .config import (
+    DEFAULT_WEIGHTS,
+    QUESTIONS_FILE,
+    WEIGHTS_FILE,
+    config_fingerprint,
+    load_questions,
+    load_weights,
+)
+
+
+def compute_roof_score(area):
+    """Calculate roof score based on usable area in m²
+    > 1000 m² = 3
+    500–1000 m² = 2
+    < 500 m² = 1
+    Missing or invalid data = 0
+    """
+    if area is None:
+        return 0
+    # Be robust if Sonnendach returns a string
+    try:
+        area_val = float(area)
+    except (TypeError, ValueError):
+        return 0
+
+    if area_val <= 0:
+        return 0
+    if area_val > 1000:
+        return 3
+    elif area_val >= 500:
+        return 2
+    else:
+        return 1
+
+
+# Score given to a select answer that matches none of the options
+DEFAULT_OPTION_SCORE = 1
+
+
+def match_option(question, answer_value):
+    """Return the index of the option a select answer refers to, or None"""
+    options = question.get("options", [])
+    for index, option in enumerate(options):
+        if option["labels"].get("en", "") == answer_value or \
+           option["labels"].get("fr", "") == answer_value or \
+           option["labels"].get("de", "") == answer_value:
+            return index
+    # If exact match not found, try partial match (for backward compatibility)
+    for index, option in enumerate(options):
+        for lang in ["en", "fr", "de"]:
+            if option["labels"].get(lang, "") in answer_value or answer_value in option["labels"].get(lang, ""):
+                return index
+    return None
+
+
+def compute_question_score(question, answer_value):
+    """Compute the score for a question based on the answer"""
+    if question["type"] == "slider":
+        # For slider questions, use scoring_thresholds
+        thresholds = question.get("scoring_thresholds", [])
+        for threshold in thresholds:
+            if answer_value >= threshold["min"]:
+                return threshold["score"]
+        return 0
+    else:
+        # For select questions, find the option and return its score
+        index = match_option(question, answer_value)
+        if index is None:
+            return DEFAULT_OPTION_SCORE
+        return question["options"][index]["score"]
+
+
+# -------------------------------------------------------
+# COMPILED SCORING MODEL
+# -------------------------------------------------------
+SCORING_LANGUAGES = ("en", "fr", "de")
+# Cap on memoized partial-match answers per question (unknown labels are rare)
+_FALLBACK_CACHE_SIZE = 256
+
+
+class _CompiledQuestion:
+    """A question prepared for constant-time scoring
+
+    Select options are addressed by index; answers that already are an index
+    (as the app stores them) need no label lookup at all. option_scores ends with
+    DEFAULT_OPTION_SCORE and threshold_scores with 0, so index -1 ("no
+    option matched" / "below every threshold") picks the fallback score.
+    """
+
+    __slots__ = (
+        "question", "id", "category", "kind", "max_score", "weight",
+        "option_scores", "label_index", "lookup", "fallback",
+        "threshold_mins", "threshold_scores",
+    )
+
+    def __init__(self, question, weights):
+        self.question = question
+        self.id = question["id"]
+        self.category = question.get("category", "consumption")
+        self.kind = question["type"]
+        self.max_score = question.get("max_score", 3)
+        self.weight = weights.get(question.get("weight_key", f"sub_{self.id}"), 0.2)
+
+        # Per-language label -> option index maps, plus one merged map for answers of unknown language.
+        # setdefault keeps the first option/language that matches, like the original label scan.
+        options = question.get("options", [])
+        self.option_scores = [option["score"] for option in options] + [DEFAULT_OPTION_SCORE]
+        self.label_index = {lang: {} for lang in SCORING_LANGUAGES}
+        self.lookup = {}
+        self.fallback = {}
+        for index, option in enumerate(options):
+            for lang in SCORING_LANGUAGES:
+                label = option["labels"].get(lang, "")
+                self.label_index[lang].setdefault(label, index)
+                self.lookup.setdefault(label, index)
+
+        # Thresholds apply in file order, first reached wins (as in compute_question_score).
+        # Stored ascending by minimum so a bisect finds the thresholds a value reaches;
+        # threshold_scores[k] is the score of the earliest one among the first k + 1
+        thresholds = question.get("scoring_thresholds", [])
+        ascending = sorted(range(len(thresholds)), key=lambda position: thresholds[position]["min"])
+        self.threshold_mins = [thresholds[position]["min"] for position in ascending]
+        self.threshold_scores = []
+        first = None
+        for position in ascending:
+            first = position if first is None else min(first, position)
+            self.threshold_scores.append(thresholds[first]["score"])
+        self.threshold_scores.append(0)
+
+    def option_index(self, answer_value):
+        """Index of the option a select answer (0-based index or label) refers to, or -1 if none matches"""
+        if type(answer_value) is int:
+            return answer_value if 0 <= answer_value < len(self.option_scores) - 1 else -1
+        index = self.lookup.get(answer_value)
+        if index is not None:
+            return index
+        if isinstance(answer_value, numbers.Integral) and not isinstance(answer_value, bool):
+            # An index of another integer type (e.g. NumPy)
+            return int(answer_value) if 0 <= answer_value < len(self.option_scores) - 1 else -1
+        index = self.fallback.get(answer_value)
+        if index is None:
+            # Legacy or truncated label: run the partial-match scan once and remember it
+            index = match_option(self.question, answer_value)
+            index = -1 if index is None else index
+            if len(self.fallback) < _FALLBACK_CACHE_SIZE:
+                self.fallback[answer_value] = index
+        return index
+
+    def score(self, answer_value):
+        if self.kind == "slider":
+            return self.threshold_scores[bisect.bisect_right(self.threshold_mins, answer_value) - 1]
+        return self.option_scores[self.option_index(answer_value)]
+
+
+@dataclass
+class ScoreResult:
+    """Everything the results page needs for one site, computed in one pass
+
+    factors maps "roof" and each answered question ID to a dict with
+    score, max, normalized (0-100) and weight.
+    """
+
+    final_score: float
+    structure_total: float
+    consumption_total: float
+    structure_weight: float
+    consumption_weight: float
+    factors: dict = field(default_factory=dict)
+
+    def details(self):
+        """Flat breakdown in the compute_detailed_scores format"""
+        detailed = dict(self.factors)
+        detailed["structure_total"] = self.structure_total
+        detailed["consumption_total"] = self.consumption_total
+        detailed["structure_weight"] = self.structure_weight
+        detailed["consumption_weight"] = self.consumption_weight
+        return detailed
+
+
+class ScoringModel:
+    """Questions and weights compiled once so scoring a site is a few dict lookups
+
+    Build it once per questions/weights configuration and reuse it for every
+    site; it is immutable apart from its partial-match memo.
+    """
+
+    def __init__(self, questions, weights):
+        self.questions = questions
+        self.weights = weights
+        # Changes whenever the questions or weights do; keys cached scores
+        self.version = config_fingerprint(questions, weights)
+
+        # Main category weights, normalized to sum to 1
+        structure_weight = weights.get("structure", DEFAULT_WEIGHTS["structure"])
+        consumption_weight = weights.get("consumption", DEFAULT_WEIGHTS["consumption"])
+        total_weight = structure_weight + consumption_weight
+        if total_weight > 0:
+            self.structure_weight = structure_weight / total_weight
+            self.consumption_weight = consumption_weight / total_weight
+        else:
+            self.structure_weight = 0.5
+            self.consumption_weight = 0.5
+
+        # Roof is always part of structure (it's not a question but a measurement)
+        self.roof_weight = weights.get("sub_roof", DEFAULT_WEIGHTS.get("sub_roof", 0.4))
+
+        self.compiled = [_CompiledQuestion(q, weights) for q in questions]
+        self.by_id = {cq.id: cq for cq in self.compiled}
+
+        # Sub-weights pre-normalized per category for the common case where every question is answered
+        structure_weights = [self.roof_weight] + [cq.weight for cq in self.compiled if cq.category == "structure"]
+        consumption_weights = [cq.weight for cq in self.compiled if cq.category != "structure"]
+        self.structure_norm_weights = self._normalize(structure_weights)
+        self.consumption_norm_weights = self._normalize(consumption_weights)
+
+    @classmethod
+    def from_files(cls, questions_path=QUESTIONS_FILE, weights_path=WEIGHTS_FILE):
+        """Compile the model from questions.json and weights.json"""
+        return cls(load_questions(questions_path), load_weights(weights_path))
+
+    @classmethod
+    def from_active(cls, questions_path=QUESTIONS_FILE, weights_path=WEIGHTS_FILE):
+        """Compile the active configuration: the history's active version if any, else the files"""
+        from .versions import load_active_config
+
+        return cls(*load_active_config(questions_path, weights_path))
+
+    @staticmethod
+    def _normalize(weights):
+        total = sum(weights)
+        if total == 0:
+            return None
+        return [w / total for w in weights]
+
+    @staticmethod
+    def _category_score(scores, weights, norm_weights):
+        if not scores:
+            return 0
+        if norm_weights is not None and len(norm_weights) == len(scores):
+            return sum(score * weight for score, weight in zip(scores, norm_weights))
+        # Some questions unanswered: renormalize over the answered ones
+        total_sub_weight = sum(weights)
+        if total_sub_weight == 0:
+            return 0
+        return sum(score * (weight / total_sub_weight) for score, weight in zip(scores, weights))
+
+    def question_score(self, question_id, answer_value):
+        """Score a single answer, or None if the question is unknown"""
+        cq = self.by_id.get(question_id)
+        return cq.score(answer_value) if cq is not None else None
+
+    def score(self, answers, roof_score):
+        """Score a site in a single pass and return the full ScoreResult"""
+        roof_norm = roof_score / 3 if roof_score > 0 else 0
+        factors = {
+            "roof": {"score": roof_score, "max": 3, "normalized": roof_norm * 100, "weight": self.roof_weight}
+        }
+        structure_scores, structure_weights = [roof_norm], [self.roof_weight]
+        consumption_scores, consumption_weights = [], []
+
+        for cq in self.compiled:
+            answer_value = answers.get(cq.id)
+            if answer_value is None:
+                continue
+
+            score = cq.score(answer_value)
+            normalized = score / cq.max_score if cq.max_score > 0 else 0
+            factors[cq.id] = {"score": score, "max": cq.max_score, "normalized": normalized * 100, "weight": cq.weight}
+
+            if cq.category == "structure":
+                structure_scores.append(normalized)
+                structure_weights.append(cq.weight)
+            else:
+                consumption_scores.append(normalized)
+                consumption_weights.append(cq.weight)
+
+        A_norm = self._category_score(structure_scores, structure_weights, self.structure_norm_weights)
+        B_norm = self._category_score(consumption_scores, consumption_weights, self.consumption_norm_weights)
+
+        # Final weighted score on a 0-100 scale
+        final_score = self.structure_weight * A_norm + self.consumption_weight * B_norm
+
+        return ScoreResult(
+            final_score=round(final_score * 100, 1),
+            structure_total=A_norm * 100,
+            consumption_total=B_norm * 100,
+            structure_weight=self.structure_weight,
+            consumption_weight=self.consumption_weight,
+            factors=factors,
+        )
+
+
+class ReloadingModel:
+    """A ScoringModel kept in sync with questions.json and weights.json
+
+    If the files have a configuration history (solar21_core.versions), the
+    model is the history's active version, so a rollback takes effect the
+    same way a save does; follow_history=False scores with the files as
+    they are (for explicitly chosen files). get() re-checks the files' (and the HEAD pointer's)
+    modification time, size and inode at most every check_interval seconds
+    and recompiles the model when any changed, so long-running processes
+    pick up configuration saves without restarts.
+    reloads counts the compiled models: callers holding on to a model can
+    compare it with the value they saw last to notice a new configuration.
+    """
+
+    def __init__(self, questions_path=QUESTIONS_FILE, weights_path=WEIGHTS_FILE, check_interval=1.0,
+                 follow_history=True):
+        from .versions import ConfigHistory, history_dir
+
+        self.paths = (Path(questions_path), Path(weights_path))
+        self.history = ConfigHistory(history_dir(questions_path)) if follow_history else None
+        self.check_interval = check_interval
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self._model = None
+        self._signature = None
+        self._checked_at = 0.0
+
+    def _file_signature(self):
+        signature = []
+        watched = (*self.paths, self.history.head_path) if self.history else self.paths
+        for path in watched:
+            try:
+                stat = path.stat()
+                # Saves rename a new file into place, so the inode changes even
+                # when size and (coarse) mtime do not
+                signature.append((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def get(self):
+        """Return the current model, reloading it first if the files changed"""
+        now = time.monotonic()
+        if self._model is not None and now - self._checked_at < self.check_interval:
+            return self._model
+        with self._lock:
+            signature = self._file_signature()
+            if self._model is None or signature != self._signature:
+                load = ScoringModel.from_active if self.history else ScoringModel.from_files
+                self._model = load(*self.paths)
+                self._signature = signature
+                self.reloads += 1
+            self._checked_at = now
+            return self._model
+
+    def invalidate(self):
+        """Re-check the files on the next get() (call right after saving them)"""
+        self._checked_at = float("-inf")
+
+
+def compute_final_score(answers, roof_score, model):
+    """Compute the final Solar21 site attractiveness score (0-100)"""
+    return model.score(answers, roof_score).final_score
+
+
+def compute_detailed_scores(answers, roof_score, model):
+    """Compute detailed breakdown of all scores for results display"""
+    return model.score(answers, roof_score).details()
+
+
+# -------------------------------------------------------
+# INTERPRETATION
+# -------------------------------------------------------
+# Lower bound of each band, best first
+SCORE_BANDS = (
+    ("exceptional", 85),
+    ("strong", 70),
+    ("moderate", 55),
+    ("weak", 40),
+    ("poor", float("-inf")),
+)
+BAND_EMOJI = {"exceptional": "🟢", "strong": "🟢", "moderate": "🟡", "weak": "🟠", "poor": "🔴"}
+
+INTERPRETATION_TEXT = {
+    "exceptional": {
+        "en": "Exceptional match",
+        "fr": "Correspondance exceptionnelle",
+        "de": "Außergewöhnliche Übereinstimmung"
+    },
+    "strong": {
+        "en": "Strong match",
+        "fr": "Forte correspondance",
+        "de": "Starke Übereinstimmung"
+    },
+    "moderate": {
+        "en": "Moderate suitability",
+        "fr": "Adéquation modérée",
+        "de": "Mäßige Eignung"
+    },
+    "weak": {
+        "en": "Weak alignment",
+        "fr": "Faible alignement",
+        "de": "Schwache Ausrichtung"
+    },
+    "poor": {
+        "en": "Poor fit",
+        "fr": "Mauvaise adéquation",
+        "de": "Schlechte Eignung"
+    }
+}
+
+RECOMMENDATION_TEXT = {
+    "exceptional": {
+        "en": "High priority opportunity.",
+        "fr": "Opportunité hautement prioritaire.",
+        "de": "Hochprioritäre Gelegenheit."
+    },
+    "strong": {
+        "en": "Promising candidate for next steps.",
+        "fr": "Candidat prometteur pour les prochaines étapes.",
+        "de": "Vielversprechender Kandidat für nächste Schritte."
+    },
+    "moderate": {
+        "en": "Needs deeper analysis (segment loads, roof segmentation).",
+        "fr": "Nécessite une analyse plus approfondie (charges par segment, segmentation du toit).",
+        "de": "Benötigt tiefere Analyse (Lastsegmente, Dachsegmentierung)."
+    },
+    "weak": {
+        "en": "Evaluate only if roof is large or strategic location.",
+        "fr": "Évaluer uniquement si le toit est grand ou l'emplacement stratégique.",
+        "de": "Nur bewerten, wenn Dach groß oder strategischer Standort."
+    },
+    "poor": {
+        "en": "Likely not viable for Solar21's model.",
+        "fr": "Probablement pas viable pour le modèle Solar21.",
+        "de": "Wahrscheinlich nicht für Solar21-Modell geeignet."
+    }
+}
+
+
+def score_band(score):
+    """Return the band key ("exceptional" ... "poor") for a 0-100 score"""
+    for band, lower in SCORE_BANDS:
+        if score >= lower:
+            return band
+    return SCORE_BANDS[-1][0]
+
+
+def get_score_interpretation(score, lang="en"):
+    """Return interpretation and recommendation based on score"""
+    band = score_band(score)
+    return (INTERPRETATION_TEXT[band][lang], RECOMMENDATION_TEXT[band][lang], BAND_EMOJI[band])
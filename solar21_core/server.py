@@ -0,0 +1,227 @@
+"""Local HTTP scoring API for the CRM (stdlib only)
+
+Keeps the compiled scoring model in memory and reloads it when
+questions.json or weights.json change on disk, so config saves made in the
+Streamlit admin page are picked up without restarting.
+
+    python -m solar21_core.server --port 8521
+
+POST /score           {"roof_area": 1200, "answers": {"q1": "Yes", ...}, "lang": "en"}
+POST /score/batch     {"sites": [<same objects as /score>, ...]}
+GET  /health
+
+Answers use the same formats as the CSV import (option text in any
+language or the 1-based option number; numbers for sliders). "roof_score"
+(0-3) may be given instead of "roof_area". The response holds the final
+score, its band and texts, and "breakdown" in the compute_detailed_scores
+format. Batch results keep the input order; invalid sites get an "errors"
+list instead of a score.
+"""
+
+import argparse
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .config import QUESTIONS_FILE, WEIGHTS_FILE
+from .scoring import (
+    INTERPRETATION_TEXT,
+    RECOMMENDATION_TEXT,
+    SCORING_LANGUAGES,
+    ReloadingModel,
+    compute_roof_score,
+    score_band,
+)
+from .sites import parse_answer
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8521
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+
+class RequestError(ValueError):
+    """The request body cannot be scored; reported to the client as a 400"""
+
+
+# -------------------------------------------------------
+# SCORING
+# -------------------------------------------------------
+def _roof_score(site, errors):
+    if "roof_score" in site:
+        roof_score = site["roof_score"]
+        if type(roof_score) is not int or not 0 <= roof_score <= 3:
+            errors.append("roof_score must be an integer from 0 to 3")
+            return 0
+        return roof_score
+    roof_area = site.get("roof_area")
+    if roof_area is None:
+        return 0
+    if isinstance(roof_area, bool) or not isinstance(roof_area, (int, float)) or roof_area < 0:
+        errors.append("roof_area must be a non-negative number")
+        return 0
+    return compute_roof_score(roof_area)
+
+
+def score_site(site, model):
+    """Score one request object; returns the response dict or {"errors": [...]}"""
+    if not isinstance(site, dict):
+        return {"errors": ["expected a JSON object"]}
+    errors = []
+    lang = site.get("lang", "en")
+    if lang not in SCORING_LANGUAGES:
+        errors.append(f"lang must be one of {', '.join(SCORING_LANGUAGES)}")
+        lang = "en"
+    roof_score = _roof_score(site, errors)
+
+    raw_answers = site.get("answers", {})
+    if not isinstance(raw_answers, dict):
+        return {"errors": errors + ["answers must be an object"]}
+    unknown = [qid for qid in raw_answers if qid not in model.by_id]
+    if unknown:
+        errors.append(f"unknown question IDs: {', '.join(map(str, unknown[:10]))}")
+    answers = {}
+    for cq in model.compiled:
+        raw = raw_answers.get(cq.id)
+        if raw is None:
+            continue
+        value = parse_answer(str(raw).strip(), cq, errors)
+        if value is not None:
+            answers[cq.id] = value
+    if errors:
+        return {"errors": errors}
+
+    result = model.score(answers, roof_score)
+    band = score_band(result.final_score)
+    return {
+        "final_score": result.final_score,
+        "band": band,
+        "interpretation": INTERPRETATION_TEXT[band][lang],
+        "recommendation": RECOMMENDATION_TEXT[band][lang],
+        "breakdown": result.details(),
+    }
+
+
+def score_batch_request(body, model):
+    sites = body.get("sites")
+    if not isinstance(sites, list):
+        raise RequestError('expected {"sites": [...]}')
+    return {"results": [score_site(site, model) for site in sites]}
+
+
+# -------------------------------------------------------
+# HTTP
+# -------------------------------------------------------
+class ScoringHandler(BaseHTTPRequestHandler):
+    # Keep-alive lets the CRM reuse one connection per worker
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY the body
+    # waits for the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+    server_version = "solar21-score"
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            raise RequestError("Content-Length is required") from None
+        if not 0 <= length <= MAX_BODY_BYTES:
+            raise RequestError(f"body must be at most {MAX_BODY_BYTES} bytes")
+        try:
+            return json.loads(self.rfile.read(length))
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise RequestError(f"invalid JSON: {exc}") from None
+
+    def do_GET(self):
+        if self.path == "/health":
+            model = self.server.model.get()
+            self._send_json(200, {"status": "ok", "questions": len(model.compiled),
+                                  "reloads": self.server.model.reloads})
+        else:
+            self._send_json(404, {"error": f"no route for GET {self.path}"})
+
+    def do_POST(self):
+        if self.path not in ("/score", "/score/batch"):
+            self._send_json(404, {"error": f"no route for POST {self.path}"})
+            return
+        try:
+            body = self._read_json()
+            if not isinstance(body, dict):
+                raise RequestError("expected a JSON object")
+            model = self.server.model.get()
+            if self.path == "/score":
+                payload = score_site(body, model)
+                status = 400 if "errors" in payload else 200
+            else:
+                payload, status = score_batch_request(body, model), 200
+        except RequestError as exc:
+            payload, status = {"error": str(exc)}, 400
+        self._send_json(status, payload)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, model, verbose=False):
+        super().__init__(address, ScoringHandler)
+        self.model = model
+        self.verbose = verbose
+
+
+def make_server(host=DEFAULT_HOST, port=DEFAULT_PORT, questions_path=None, weights_path=None, verbose=False):
+    """Build a ScoringServer with the model already compiled (call serve_forever to run it)
+
+    Without questions_path and weights_path it serves the active configuration
+    version; given files are served as they are.
+    """
+    explicit = questions_path is not None or weights_path is not None
+    model = ReloadingModel(questions_path or QUESTIONS_FILE, weights_path or WEIGHTS_FILE,
+                           follow_history=not explicit)
+    model.get()
+    return ScoringServer((host, port), model, verbose=verbose)
+
+
+# -------------------------------------------------------
+# ENTRY POINT
+# -------------------------------------------------------
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="solar21-server",
+        description="Serve Solar21 site scoring over HTTP with the model kept in memory.",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"address to bind (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT})")
+    parser.add_argument("--questions",
+                        help=f"questions file to score with (default: the active version of {QUESTIONS_FILE})")
+    parser.add_argument("--weights",
+                        help=f"weights file to score with (default: the active version of {WEIGHTS_FILE})")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    server = make_server(args.host, args.port, args.questions, args.weights, args.verbose)
+    print(f"solar21-server: listening on http://{args.host}:{args.port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""Reading site portfolios (address, canton, roof data, optional answers) from CSV/Excel
+
+Rows are validated one at a time while the file is read in chunks, so a
+large portfolio never has to be fully materialized before errors show up.
+pandas is imported lazily.
+"""
+
+import csv
+from dataclasses import dataclass, field
+from pathlib import PurePath
+
+CANTONS = ["ZH", "SG", "VD", "BE", "GE", "TI", "VS", "LU", "FR", "AG", "BL",
+           "BS", "TG", "SO", "NE", "SH", "ZG", "OW", "NW", "UR", "GL", "AI", "AR", "JU"]
+
+SITE_COLUMNS = ["address", "canton", "roof_area", "roof_pitch", "roof_orientation"]
+
+# Accepted alternative headers (after lower-casing and replacing spaces with "_")
+COLUMN_ALIASES = {
+    "full_address": "address",
+    "area": "roof_area",
+    "pitch": "roof_pitch",
+    "orientation": "roof_orientation",
+}
+
+# (min, max) accepted for each numeric roof column
+ROOF_RANGES = {
+    "roof_area": (0.0, None),
+    "roof_pitch": (0.0, 90.0),
+    "roof_orientation": (0.0, 360.0),
+}
+
+CSV_CHUNK_SIZE = 1000
+
+
+class SiteFileError(ValueError):
+    """The file cannot be read as a site table at all (format, missing columns)"""
+
+
+@dataclass
+class SiteRow:
+    """One validated row: a site entry plus its answers
+
+    answers maps question IDs to the option index (select questions) or the
+    value (slider questions) for every answer column that was filled.
+    """
+
+    line: int
+    site: dict
+    answers: dict = field(default_factory=dict)
+
+
+@dataclass
+class SiteImport:
+    rows: list = field(default_factory=list)
+    errors: list = field(default_factory=list)  # (line, message)
+    total_rows: int = 0
+
+
+def normalize_column(name):
+    key = str(name).strip().lower().replace(" ", "_").replace("-", "_")
+    return COLUMN_ALIASES.get(key, key)
+
+
+def _parse_number(raw, column, errors):
+    if raw == "":
+        return None
+    try:
+        value = float(raw.replace("'", "").replace(",", "."))
+    except ValueError:
+        errors.append(f"{column}: '{raw}' is not a number")
+        return None
+    low, high = ROOF_RANGES[column]
+    if value < low or (high is not None and value > high):
+        bounds = f"{low:g}–{high:g}" if high is not None else f">= {low:g}"
+        errors.append(f"{column}: {value:g} is outside {bounds}")
+        return None
+    # 0 means "not provided", like in the manual entry form
+    return value if value > 0 else None
+
+
+def parse_answer(raw, cq, errors):
+    """Encode one raw answer for a compiled question; None if empty or invalid (errors gets a message)"""
+    if raw == "":
+        return None
+    if cq.kind == "slider":
+        try:
+            value = float(raw.replace(",", "."))
+        except ValueError:
+            errors.append(f"{cq.id}: '{raw}' is not a number")
+            return None
+        low = cq.question.get("min_value", 0)
+        high = cq.question.get("max_value", 100)
+        if not low <= value <= high:
+            errors.append(f"{cq.id}: {value:g} is outside {low}–{high}")
+            return None
+        return int(value) if value.is_integer() else value
+
+    # Select questions: option number (1-based) or an option's exact label in any language.
+    # Anything else is an error rather than a guess (no partial matching).
+    n_options = len(cq.option_scores) - 1
+    try:
+        number = float(raw)
+    except ValueError:
+        number = None
+    if number is not None and number.is_integer():
+        if 1 <= number <= n_options:
+            return int(number) - 1
+        errors.append(f"{cq.id}: option {number:g} does not exist (1–{n_options})")
+        return None
+    index = cq.lookup.get(raw)
+    if index is None:
+        errors.append(f"{cq.id}: '{raw[:40]}' does not match any option")
+        return None
+    return index
+
+
+def validate_row(line, record, model):
+    """Validate one raw row (column -> string); returns (SiteRow or None, errors)"""
+    errors = []
+    address = record.get("address", "").strip()
+    if not address:
+        errors.append("address is required")
+
+    canton = record.get("canton", "").strip().upper()
+    if canton and canton not in CANTONS:
+        errors.append(f"canton: '{canton}' is not a Swiss canton code")
+        canton = ""
+
+    site = {"address": address, "canton": canton}
+    for column in ROOF_RANGES:
+        site[column] = _parse_number(record.get(column, "").strip(), column, errors)
+
+    answers = {}
+    for cq in model.compiled:
+        value = parse_answer(record.get(cq.id, "").strip(), cq, errors)
+        if value is not None:
+            answers[cq.id] = value
+
+    if errors:
+        return None, errors
+    return SiteRow(line=line, site=site, answers=answers), errors
+
+
+def _csv_delimiter(source):
+    """"," or ";" (Swiss Excel exports use semicolons), picked from the header line like cli.iter_csv_records"""
+    if hasattr(source, "read"):
+        position = source.tell()
+        header = source.readline()
+        source.seek(position)
+    else:
+        with open(source, "rb") as stream:
+            header = stream.readline()
+    if isinstance(header, bytes):
+        header = header.decode("utf-8-sig", errors="replace")
+    return ";" if header.count(";") > header.count(",") else ","
+
+
+def _iter_frames(source, filename):
+    import pandas as pd
+
+    suffix = PurePath(filename).suffix.lower()
+    try:
+        if suffix in (".xlsx", ".xls"):
+            # Excel cannot be read in chunks; it is still validated row by row below
+            yield pd.read_excel(source, dtype=str, keep_default_na=False)
+        elif suffix in (".csv", ".txt", ""):
+            yield from pd.read_csv(
+                source, dtype=str, keep_default_na=False, sep=_csv_delimiter(source),
+                chunksize=CSV_CHUNK_SIZE, encoding="utf-8-sig",
+            )
+        else:
+            raise SiteFileError(f"Unsupported file type '{suffix}' (use .csv or .xlsx)")
+    except SiteFileError:
+        raise
+    except ImportError as exc:
+        raise SiteFileError(f"Reading {suffix} files needs an extra package: {exc}") from exc
+    except (ValueError, csv.Error, pd.errors.ParserError) as exc:
+        raise SiteFileError(f"Could not read the file: {exc}") from exc
+
+
+def iter_site_rows(source, filename, model):
+    """Yield (SiteRow or None, line, errors) for every data row of a CSV/XLSX file
+
+    line is the 1-based line in the file (the header is line 1).
+    Raises SiteFileError if the file is unreadable or has no address column.
+    """
+    line = 1
+    for frame in _iter_frames(source, filename):
+        columns = [normalize_column(c) for c in frame.columns]
+        if "address" not in columns:
+            raise SiteFileError("The file needs an 'address' column")
+        for values in frame.itertuples(index=False, name=None):
+            line += 1
+            record = {col: str(value) for col, value in zip(columns, values)}
+            row, errors = validate_row(line, record, model)
+            yield row, line, errors
+
+
+def _cell_text(value, pd):
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    return str(value)
+
+
+def sites_frame(sites):
+    """DataFrame with one row per site entry (SITE_COLUMNS; missing roof data as NaN)"""
+    import pandas as pd
+
+    frame = pd.DataFrame(
+        [[site.get(column) for column in SITE_COLUMNS] for site in sites], columns=SITE_COLUMNS,
+    )
+    frame[["address", "canton"]] = frame[["address", "canton"]].fillna("")
+    for column in ROOF_RANGES:
+        frame[column] = pd.to_numeric(frame[column], errors="coerce")
+    return frame
+
+
+def read_frame(frame, model, max_errors=50):
+    """Validate an edited site table (e.g. from st.data_editor) like a file upload
+
+    Lines are numbered as in a file with a header: the first row is line 2.
+    """
+    import pandas as pd
+
+    result = SiteImport()
+    columns = [normalize_column(c) for c in frame.columns]
+    for line, values in enumerate(frame.itertuples(index=False, name=None), start=2):
+        record = {col: _cell_text(value, pd) for col, value in zip(columns, values)}
+        row, errors = validate_row(line, record, model)
+        result.total_rows += 1
+        if row is not None:
+            result.rows.append(row)
+        elif len(result.errors) < max_errors:
+            result.errors.extend((line, message) for message in errors)
+    return result
+
+
+def read_sites(source, filename, model, max_errors=50):
+    """Read and validate a whole site file; invalid rows are reported, not imported"""
+    result = SiteImport()
+    for row, line, errors in iter_site_rows(source, filename, model):
+        result.total_rows += 1
+        if row is not None:
+            result.rows.append(row)
+        elif len(result.errors) < max_errors:
+            result.errors.extend((line, message) for message in errors)
+    return result
+
+
+def template_csv(model, lang="en"):
+    """CSV header plus one example row, for partners to fill in"""
+    import csv
+    import io
+
+    header = SITE_COLUMNS + [cq.id for cq in model.compiled]
+    example = ["Bahnhofstrasse 1, 8001 Zürich", "ZH", "1200", "15", "180"]
+    for cq in model.compiled:
+        if cq.kind == "slider":
+            example.append(str(cq.question.get("default_value", 50)))
+        else:
+            options = cq.question.get("options", [])
+            example.append(options[0]["labels"].get(lang, options[0]["labels"].get("en", "")) if options else "")
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    writer.writerow(example)
+    return buffer.getvalue()
@@ -0,0 +1,98 @@
+"""Crash- and concurrency-safe JSON config files (weights.json, questions.json)
+
+A save writes the new content to a temporary file next to the target,
+fsyncs it and renames it over the target, so a reader sees either the old
+or the new file, never half of one, even if the writer dies. Writers take
+an advisory lock on "<file>.lock" for the whole read-version/write/rename
+sequence, so concurrent saves from several app workers are serialized, and
+every save stores a "version" one higher than the file it replaces.
+solar21_core.store_stress checks this with concurrent processes.
+"""
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+VERSION_KEY = "version"
+LOCK_SUFFIX = ".lock"
+
+
+@contextmanager
+def locked(path):
+    """Hold the exclusive advisory lock of a config file (blocks until it is free)"""
+    path = Path(path)
+    lock_path = path.with_name(path.name + LOCK_SUFFIX)
+    with open(lock_path, "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _fsync_directory(directory):
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path, text):
+    """Replace path with text: temporary file, fsync, rename (callers serialize with locked())"""
+    path = Path(path)
+    directory = path.parent if str(path.parent) else Path(".")
+    fd, temp_name = tempfile.mkstemp(dir=directory, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+    # Make the rename itself durable
+    _fsync_directory(directory)
+
+
+def read_json(path):
+    """Parsed content of a config file (raises OSError / ValueError like json.load)"""
+    with Path(path).open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def read_version(path):
+    """Version of a config file; 0 if it has none or does not exist"""
+    try:
+        data = read_json(path)
+    except (OSError, ValueError):
+        return 0
+    version = data.get(VERSION_KEY, 0) if isinstance(data, dict) else 0
+    return version if isinstance(version, int) else 0
+
+
+def save_json(path, payload, **dump_options):
+    """Atomically write payload (a dict) with the next version number; returns that version"""
+    with locked(path):
+        version = read_version(path) + 1
+        atomic_write(path, json.dumps({**payload, VERSION_KEY: version}, **dump_options))
+    return version
@@ -0,0 +1,98 @@
+"""Concurrency stress test of solar21_core.store
+
+Writer processes save one config file over and over while reader processes
+read it, and every read is checked: no torn or inconsistent content, no
+version going backwards, no lost write.
+
+    python -m solar21_core.store_stress [--writers 8] [--readers 8] [--writes 100]
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+from .store import VERSION_KEY, read_json, read_version, save_json
+
+
+def _stress_writer(path, writer, writes):
+    for seq in range(writes):
+        # A few KB per file, so torn writes would show up as invalid JSON
+        save_json(path, {"writer": writer, "seq": seq, "payload": [writer * seq] * 500}, indent=2)
+
+
+def _stress_reader(path, done, queue):
+    reads, last_version, errors = 0, 0, []
+    while not done.is_set():
+        try:
+            data = read_json(path)
+        except FileNotFoundError:
+            continue
+        except ValueError as exc:
+            errors.append(f"torn read: {exc}")
+            continue
+        reads += 1
+        version = data[VERSION_KEY]
+        if version < last_version:
+            errors.append(f"version went back from {last_version} to {version}")
+        if data["payload"] != [data["writer"] * data["seq"]] * 500:
+            errors.append(f"inconsistent content in version {version}")
+        last_version = version
+    queue.put((reads, errors[:10]))
+
+
+def stress(path, writers=8, readers=8, writes=100):
+    """Run writer and reader processes against one file until the writers finish
+
+    Returns (final version, reads, problems); no problems means no torn or
+    inconsistent read, no version going backwards and no lost write.
+    """
+    import multiprocessing
+
+    path = Path(path)
+    expected = read_version(path) + writers * writes
+    done, queue = multiprocessing.Event(), multiprocessing.Queue()
+    writer_procs = [multiprocessing.Process(target=_stress_writer, args=(path, n, writes)) for n in range(writers)]
+    reader_procs = [multiprocessing.Process(target=_stress_reader, args=(path, done, queue)) for _ in range(readers)]
+    for proc in writer_procs + reader_procs:
+        proc.start()
+    for proc in writer_procs:
+        proc.join()
+    done.set()
+    results = [queue.get(timeout=60) for _ in reader_procs]
+    for proc in reader_procs:
+        proc.join()
+
+    errors = [error for _, reader_errors in results for error in reader_errors]
+    if any(proc.exitcode for proc in writer_procs):
+        errors.append("a writer process failed")
+    final = read_version(path)
+    if final != expected:
+        errors.append(f"final version {final}, expected {expected} (lost writes)")
+    return final, sum(reads for reads, _ in results), errors
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="solar21-store-stress",
+        description="Hammer one config file with concurrent writer and reader processes.",
+    )
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=100, help="saves per writer")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    with tempfile.TemporaryDirectory() as directory:
+        final, reads, errors = stress(Path(directory) / "weights.json", args.writers, args.readers, args.writes)
+    for error in errors:
+        print(error, file=sys.stderr)
+    print(f"solar21-store-stress: {args.writers} writers x {args.writes} saves, {reads} reads by {args.readers} readers, "
+          f"final version {final}, {len(errors)} problem(s)")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
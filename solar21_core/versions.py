@@ -0,0 +1,371 @@
+"""Versioned configuration history: every saved questions/weights pair, diff and rollback
+
+Each save of the configuration is stored once, content-addressed, under
+config_history/ next to questions.json:
+
+    objects/<id>.json   one version ({"questions": [...], "weights": {...}}), never modified
+    log.jsonl           append-only: one line per save or rollback, with author and time
+    HEAD                id of the active version
+
+Any version is read directly from its object file, and the log is indexed
+in memory, so retrieving a version by id or number costs one file read.
+Rolling back only replaces HEAD (atomically); no version and no config
+file is rewritten. Live models (ReloadingModel) follow HEAD.
+
+    python -m solar21_core.versions log
+    python -m solar21_core.versions diff v3 v5
+    python -m solar21_core.versions rollback v3 --author anna
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+from .config import QUESTIONS_FILE, WEIGHTS_FILE, load_questions, load_weights, normalize_weights
+from .store import atomic_write, locked
+
+HISTORY_DIR_NAME = "config_history"
+
+# Rounding of weights before comparing, so float noise from normalization is no change
+_WEIGHT_DIGITS = 9
+
+
+def history_dir(questions_path=QUESTIONS_FILE):
+    """The configuration history that belongs with a questions.json"""
+    return Path(questions_path).parent / HISTORY_DIR_NAME
+
+
+def _canonical(questions, weights):
+    return json.dumps({"questions": questions, "weights": weights}, sort_keys=True, ensure_ascii=False,
+                      separators=(",", ":"))
+
+
+def version_id(questions, weights):
+    """Content address of a configuration: the same questions and weights always get the same id"""
+    return hashlib.blake2b(_canonical(questions, weights).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ConfigHistory:
+    """Append-only store of configuration versions with a movable active pointer (HEAD)
+
+    Safe for several threads and processes: writers serialize on the lock of
+    log.jsonl, object files are written once, and HEAD is replaced atomically.
+    """
+
+    def __init__(self, root=None):
+        self.root = Path(root) if root is not None else history_dir()
+        self.objects = self.root / "objects"
+        self.log_path = self.root / "log.jsonl"
+        self.head_path = self.root / "HEAD"
+        self._lock = threading.Lock()
+        self._entries = []
+        self._versions = []
+        self._by_id = {}
+        self._log_size = 0
+
+    # ── READING ──
+    def _refresh(self):
+        """Index log lines appended since the last call (by this or another process)"""
+        try:
+            size = self.log_path.stat().st_size
+        except OSError:
+            return
+        if size == self._log_size:
+            return
+        with self.log_path.open("rb") as handle:
+            handle.seek(self._log_size)
+            chunk = handle.read(size - self._log_size)
+        # A line is only indexed once it is complete
+        complete = chunk[:chunk.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            entry = json.loads(line)
+            self._entries.append(entry)
+            if entry["id"] not in self._by_id:
+                self._by_id[entry["id"]] = entry
+                self._versions.append(entry)
+        self._log_size += len(complete)
+
+    def entries(self):
+        """Every log entry (saves and rollbacks), oldest first"""
+        with self._lock:
+            self._refresh()
+            return list(self._entries)
+
+    def versions(self):
+        """The first save of every version, oldest first; entry["version"] numbers them from 1"""
+        with self._lock:
+            self._refresh()
+            return list(self._versions)
+
+    def head(self):
+        """Id of the active version, or None before the first save"""
+        try:
+            return self.head_path.read_text(encoding="utf-8").strip() or None
+        except OSError:
+            return None
+
+    def resolve(self, ref):
+        """Version id of an id, a unique id prefix or a version number (3 or "v3"); KeyError if none
+
+        Ids and id prefixes are matched first, so an all-digit prefix like
+        "31" is only read as a version number when no id starts with it.
+        """
+        with self._lock:
+            self._refresh()
+            if not isinstance(ref, int):
+                ref = str(ref)
+                if ref in self._by_id:
+                    return ref
+                matches = [vid for vid in self._by_id if vid.startswith(ref)]
+                if len(matches) > 1:
+                    raise KeyError(f"ambiguous version {ref!r}")
+                if matches:
+                    return matches[0]
+                number = ref[1:] if ref[:1] in ("v", "V") else ref
+                if not number.isdigit():
+                    raise KeyError(f"no version {ref!r}")
+                ref = int(number)
+            if not 1 <= ref <= len(self._versions):
+                raise KeyError(f"no version {ref}")
+            return self._versions[ref - 1]["id"]
+
+    def entry(self, ref):
+        """The save entry of a version (author, time, message, number)"""
+        vid = self.resolve(ref)
+        with self._lock:
+            return self._by_id[vid]
+
+    def get(self, ref):
+        """(questions, weights) of a version exactly as saved"""
+        vid = self.resolve(ref)
+        data = json.loads((self.objects / f"{vid}.json").read_text(encoding="utf-8"))
+        return data["questions"], data["weights"]
+
+    def active(self):
+        """(questions, weights) of HEAD as the scoring model uses them, or None before the first save"""
+        vid = self.head()
+        if vid is None:
+            return None
+        questions, weights = self.get(vid)
+        return questions, normalize_weights(weights)
+
+    # ── WRITING ──
+    def _append(self, entry):
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self.log_path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            handle.flush()
+
+    def _set_head(self, vid):
+        atomic_write(self.head_path, vid + "\n")
+
+    def commit(self, questions, weights, author="", message=""):
+        """Record a saved configuration and make it active; returns its version id
+
+        Saving the active configuration again records nothing; saving an
+        earlier version's content again logs the save under that version.
+        """
+        self.objects.mkdir(parents=True, exist_ok=True)
+        with locked(self.log_path):
+            return self._commit(questions, weights, author, message)
+
+    def _commit(self, questions, weights, author, message):
+        """commit() for a caller already holding the log lock"""
+        vid = version_id(questions, weights)
+        with self._lock:
+            self._refresh()
+            known = self._by_id.get(vid)
+            number = known["version"] if known else len(self._versions) + 1
+        if known and self.head() == vid:
+            return vid
+        path = self.objects / f"{vid}.json"
+        if not path.exists():
+            atomic_write(path, _canonical(questions, weights))
+        self._append({
+            "action": "save", "version": number, "id": vid, "parent": self.head(),
+            "author": author, "created_at": time.time(), "message": message,
+        })
+        self._set_head(vid)
+        return vid
+
+    def rollback(self, ref, author="", message=""):
+        """Make an earlier version active again by moving HEAD; returns its id"""
+        vid = self.resolve(ref)
+        with locked(self.log_path):
+            previous = self.head()
+            if previous == vid:
+                return vid
+            self._append({
+                "action": "rollback", "version": self.entry(vid)["version"], "id": vid, "parent": previous,
+                "author": author, "created_at": time.time(), "message": message,
+            })
+            self._set_head(vid)
+        return vid
+
+
+def commit_files(history, questions, weights, author="", message="",
+                 questions_path=QUESTIONS_FILE, weights_path=WEIGHTS_FILE):
+    """Record a configuration that is about to be written to the files
+
+    The first save also records the configuration it replaces, so even the
+    first careless save can be rolled back.
+    """
+    history.objects.mkdir(parents=True, exist_ok=True)
+    # HEAD is checked under the log lock, so concurrent first saves record the baseline once
+    with locked(history.log_path):
+        if history.head() is None:
+            history._commit(load_questions(questions_path), load_weights(weights_path), "",
+                            "Configuration before the first recorded save")
+        return history._commit(questions, weights, author, message)
+
+
+def load_active_config(questions_path=QUESTIONS_FILE, weights_path=WEIGHTS_FILE):
+    """(questions, weights) to score with: the active version if the files have a history, else the files"""
+    active = ConfigHistory(history_dir(questions_path)).active()
+    if active is not None:
+        return active
+    return load_questions(questions_path), load_weights(weights_path)
+
+
+# -------------------------------------------------------
+# DIFF
+# -------------------------------------------------------
+def _option_key(option, position):
+    labels = option.get("labels") or {}
+    return labels.get("en") or next((text for text in labels.values() if text), f"#{position + 1}")
+
+
+def _short(label):
+    # Option labels are "<answer> — <explanation>"; the answer is enough to recognize it
+    return label.split("—")[0].strip()
+
+
+def diff_configs(old, new):
+    """Structured difference between two (questions, weights) configurations
+
+    Returns a dict of lists, empty when nothing changed:
+      weights_changed    (key, old, new); None for a key that is added or removed
+      questions_added    question ids
+      questions_removed  question ids
+      options_rescored   (question id, option, old score, new score)
+      options_added      (question id, option)
+      options_removed    (question id, option)
+      questions_edited   (question id, [changed fields]) for any other change
+    Options are matched by their English label.
+    """
+    (old_questions, old_weights), (new_questions, new_weights) = old, new
+    diff = {key: [] for key in ("weights_changed", "questions_added", "questions_removed", "options_rescored",
+                                "options_added", "options_removed", "questions_edited")}
+
+    for key in sorted(set(old_weights) | set(new_weights)):
+        before, after = old_weights.get(key), new_weights.get(key)
+        if before is None or after is None or round(before, _WEIGHT_DIGITS) != round(after, _WEIGHT_DIGITS):
+            diff["weights_changed"].append((key, before, after))
+
+    old_by_id = {question["id"]: question for question in old_questions}
+    new_by_id = {question["id"]: question for question in new_questions}
+    diff["questions_added"] = [qid for qid in new_by_id if qid not in old_by_id]
+    diff["questions_removed"] = [qid for qid in old_by_id if qid not in new_by_id]
+
+    for qid, after in new_by_id.items():
+        before = old_by_id.get(qid)
+        if before is None or before == after:
+            continue
+        old_options = {_option_key(option, n): option for n, option in enumerate(before.get("options", []))}
+        new_options = {_option_key(option, n): option for n, option in enumerate(after.get("options", []))}
+        for label, option in new_options.items():
+            if label not in old_options:
+                diff["options_added"].append((qid, label))
+            elif option.get("score") != old_options[label].get("score"):
+                diff["options_rescored"].append((qid, label, old_options[label].get("score"), option.get("score")))
+        diff["options_removed"].extend((qid, label) for label in old_options if label not in new_options)
+
+        fields = sorted(
+            name for name in set(before) | set(after)
+            if name != "options" and before.get(name) != after.get(name)
+        )
+        # Same options in a new order or with retranslated labels
+        if list(old_options) == list(new_options) and before.get("options") != after.get("options") \
+                and not any(change[0] == qid for change in diff["options_rescored"]):
+            fields.append("options")
+        if fields:
+            diff["questions_edited"].append((qid, fields))
+    return diff
+
+
+def format_diff(diff):
+    """Human-readable lines of a diff_configs() result"""
+    lines = []
+    for key, before, after in diff["weights_changed"]:
+        lines.append(f"weight {key}: {_format_weight(before)} → {_format_weight(after)}")
+    lines += [f"question added: {qid}" for qid in diff["questions_added"]]
+    lines += [f"question removed: {qid}" for qid in diff["questions_removed"]]
+    lines += [f"{qid}: \"{_short(label)}\" rescored {before} → {after}"
+              for qid, label, before, after in diff["options_rescored"]]
+    lines += [f"{qid}: option added \"{_short(label)}\"" for qid, label in diff["options_added"]]
+    lines += [f"{qid}: option removed \"{_short(label)}\"" for qid, label in diff["options_removed"]]
+    lines += [f"{qid}: {', '.join(fields)} changed" for qid, fields in diff["questions_edited"]]
+    return lines
+
+
+def _format_weight(value):
+    return "—" if value is None else f"{value:.1%}"
+
+
+# -------------------------------------------------------
+# ENTRY POINT
+# -------------------------------------------------------
+def build_parser():
+    parser = argparse.ArgumentParser(prog="solar21-versions", description="Configuration history: log, diff, rollback.")
+    parser.add_argument("--history", default=str(history_dir()), help="history directory (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("log", help="list saves and rollbacks, oldest first")
+    diff_parser = commands.add_parser("diff", help="what changed between two versions (v3, or an id or id prefix)")
+    diff_parser.add_argument("old")
+    diff_parser.add_argument("new", nargs="?", help="default: the active version")
+    commit_parser = commands.add_parser("commit", help="record questions.json and weights.json as a new version")
+    commit_parser.add_argument("--questions", default=str(QUESTIONS_FILE))
+    commit_parser.add_argument("--weights", default=str(WEIGHTS_FILE))
+    for command in (commit_parser, commands.add_parser("rollback", help="make an earlier version active")):
+        command.add_argument("--author", default="")
+        command.add_argument("-m", "--message", default="")
+    commands.choices["rollback"].add_argument("version")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    history = ConfigHistory(args.history)
+    try:
+        if args.command == "log":
+            entries = history.entries()
+            for position, entry in enumerate(entries, start=1):
+                when = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["created_at"]))
+                # The last entry set the current HEAD
+                marker = "*" if position == len(entries) else " "
+                print(f"{marker} v{entry['version']:<4} {entry['id'][:10]}  {when}  {entry['action']:8}  "
+                      f"{entry['author'] or '-':12}  {entry['message']}")
+        elif args.command == "diff":
+            new_ref = args.new or history.head()
+            if new_ref is None:
+                raise KeyError("no active version")
+            for line in format_diff(diff_configs(history.get(args.old), history.get(new_ref))) or ["no changes"]:
+                print(line)
+        elif args.command == "commit":
+            vid = history.commit(load_questions(args.questions), load_weights(args.weights), args.author, args.message)
+            print(f"active version v{history.entry(vid)['version']} {vid[:10]}")
+        else:
+            vid = history.rollback(args.version, args.author, args.message)
+            print(f"active version v{history.entry(vid)['version']} {vid[:10]}")
+    except KeyError as exc:
+        print(f"solar21-versions: {exc.args[0]}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
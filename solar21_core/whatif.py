@@ -0,0 +1,140 @@
+"""What-if previews of weight changes on a fixed portfolio
+
+A portfolio is reduced once to two (sites x factors) matrices, where the
+factors are the roof plus one column per question: the normalized score of
+each answered factor and an answered mask. Final scores for any set of
+weights are then two matrix products with a (factors x 2) weight matrix,
+cheap enough to redo on every slider move for thousands of sites.
+
+Unanswered questions are renormalized away per site exactly like
+ScoringModel.score; scores can differ from it in the last bit of floating
+point, so a preview compares previews on both sides.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .batch import BAND_NAMES, _question_scores, _round_1, compute_roof_scores, score_bands
+from .config import DEFAULT_WEIGHTS
+
+
+@dataclass
+class PortfolioFactors:
+    """Per-factor normalized scores of a portfolio, independent of the weights"""
+
+    factor_keys: list        # weight key of every column ("sub_roof" first)
+    structure: np.ndarray    # True for the structure columns
+    scores: np.ndarray       # sites x factors, normalized score (0-1), 0 where unanswered
+    answered: np.ndarray     # sites x factors, 1.0 where answered
+
+    @classmethod
+    def from_answers(cls, roof_areas, answer_matrix, model):
+        """Build from the score_batch inputs (see solar21_core.batch)"""
+        roof_areas = np.asarray(roof_areas, dtype=float)
+        answer_matrix = np.asarray(answer_matrix, dtype=float)
+        n_sites = len(roof_areas)
+
+        roof_scores = compute_roof_scores(roof_areas)
+        columns = [np.where(roof_scores > 0, roof_scores / 3, 0.0)]
+        answered = [np.ones(n_sites, dtype=bool)]
+        keys, structure = ["sub_roof"], [True]
+        for col, cq in enumerate(model.compiled):
+            scores, is_answered = _question_scores(cq, answer_matrix[:, col])
+            normalized = scores / cq.max_score if cq.max_score > 0 else np.zeros(n_sites)
+            columns.append(np.where(is_answered, normalized, 0.0))
+            answered.append(is_answered)
+            keys.append(cq.question.get("weight_key", f"sub_{cq.id}"))
+            structure.append(cq.category == "structure")
+
+        return cls(
+            factor_keys=keys,
+            structure=np.array(structure),
+            scores=np.column_stack(columns),
+            answered=np.column_stack(answered).astype(float),
+        )
+
+    def __len__(self):
+        return len(self.scores)
+
+    def weight_matrix(self, weights):
+        """(factors x 2) sub-weights split into a structure and a consumption column"""
+        defaults = {"sub_roof": DEFAULT_WEIGHTS["sub_roof"]}
+        vector = np.array([weights.get(key, defaults.get(key, 0.2)) for key in self.factor_keys], dtype=float)
+        return np.column_stack([np.where(self.structure, vector, 0.0), np.where(self.structure, 0.0, vector)])
+
+    def final_scores(self, weights):
+        """Final score (0-100, one decimal) of every site under the given weights
+
+        Sub-weights need not be normalized (slider percentages work as is);
+        the main structure/consumption weights are normalized like ScoringModel.
+        """
+        matrix = self.weight_matrix(weights)
+        weighted = self.scores @ matrix
+        total_weight = self.answered @ matrix
+        category = np.divide(weighted, total_weight, out=np.zeros_like(weighted), where=total_weight != 0)
+
+        structure_w = weights.get("structure", DEFAULT_WEIGHTS["structure"])
+        consumption_w = weights.get("consumption", DEFAULT_WEIGHTS["consumption"])
+        main_total = structure_w + consumption_w
+        if main_total > 0:
+            main = np.array([structure_w, consumption_w]) / main_total
+        else:
+            main = np.array([0.5, 0.5])
+        return _round_1(category @ main * 100)
+
+
+def ranks(final_scores):
+    """1-based rank of every site, best score first (ties keep portfolio order)"""
+    order = np.argsort(-np.asarray(final_scores), kind="stable")
+    result = np.empty(len(order), dtype=np.int64)
+    result[order] = np.arange(1, len(order) + 1)
+    return result
+
+
+@dataclass
+class WhatIf:
+    """Current vs previewed scores of the same portfolio"""
+
+    current_scores: np.ndarray
+    preview_scores: np.ndarray
+
+    def __post_init__(self):
+        self.current_ranks = ranks(self.current_scores)
+        self.preview_ranks = ranks(self.preview_scores)
+        self.current_bands = score_bands(self.current_scores)
+        self.preview_bands = score_bands(self.preview_scores)
+
+    @property
+    def rank_changes(self):
+        """Positive when a site moves up the ranking"""
+        return self.current_ranks - self.preview_ranks
+
+    def band_migrations(self):
+        """(bands x bands) counts of sites moving from the current band (rows) to the preview band"""
+        n_bands = len(BAND_NAMES)
+        counts = np.bincount(self.current_bands * n_bands + self.preview_bands, minlength=n_bands * n_bands)
+        return counts.reshape(n_bands, n_bands)
+
+    @property
+    def band_changes(self):
+        return int(np.count_nonzero(self.current_bands != self.preview_bands))
+
+
+def what_if(factors, current_weights, preview_weights):
+    return WhatIf(factors.final_scores(current_weights), factors.final_scores(preview_weights))
+
+
+def sample_answers(model, n_sites, seed=21):
+    """A synthetic portfolio (roof areas, answer matrix) with uniformly drawn answers"""
+    rng = np.random.default_rng(seed)
+    roof_areas = rng.choice([np.nan, 250.0, 750.0, 1500.0], size=n_sites, p=[0.1, 0.4, 0.3, 0.2])
+    matrix = np.empty((n_sites, len(model.compiled)))
+    for col, cq in enumerate(model.compiled):
+        if cq.kind == "slider":
+            low = cq.question.get("min_value", 0)
+            high = cq.question.get("max_value", 100)
+            matrix[:, col] = rng.integers(low, high, endpoint=True, size=n_sites)
+        else:
+            matrix[:, col] = rng.integers(0, max(len(cq.option_scores) - 1, 1), size=n_sites)
+    return roof_areas, matrix